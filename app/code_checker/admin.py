@@ -1,18 +1,40 @@
 from django.contrib import admin
 
-from code_checker.models import CheckLog, CodeCheck
+from code_checker.dirty_files import mark_files_dirty
+from code_checker.models import CheckLog, CheckViolation, CodeCheck, CodeCheckStatus
 
 
 @admin.register(CodeCheck)
 class CodeCheckAdmin(admin.ModelAdmin):
     """Register the CodeCheck model and settings fields for admin."""
 
-    list_display = ('file',)
+    list_display = ('file', 'status', 'attempts', 'next_attempt_at')
+    list_filter = ('status',)
     fields = (
         ('file', 'timestamp'),
         ('status', 'is_notified'),
+        ('attempts', 'next_attempt_at'),
         'last_check_result',
     )
+    actions = ('retry_checks',)
+
+    @admin.action(description='Retry selected checks')
+    def retry_checks(self, request, queryset):
+        """
+        Reset failed attempts of the selected quarantined checks, so their files are checked again.
+
+        Other checks are left as they are, their files are either checked already or still waiting for the check.
+        """
+        quarantined_checks = queryset.filter(status=CodeCheckStatus.QUARANTINED.value)
+        file_ids = list(quarantined_checks.values_list('file', flat=True))
+        retried_count = quarantined_checks.update(
+            status=CodeCheckStatus.UNCHECKED.value,
+            attempts=0,
+            next_attempt_at=None,
+        )
+
+        mark_files_dirty(file_ids=file_ids)
+        self.message_user(request, f'{retried_count} checks are scheduled for retry')
 
 
 @admin.register(CheckLog)
@@ -21,3 +43,12 @@ class CheckLogAdmin(admin.ModelAdmin):
 
     list_display = ('code_check',)
     fields = ('code_check',)
+
+
+@admin.register(CheckViolation)
+class CheckViolationAdmin(admin.ModelAdmin):
+    """Register the CheckViolation model and settings fields for admin."""
+
+    list_display = ('code_check', 'error_code', 'line', 'column')
+    list_filter = ('error_code',)
+    fields = ('code_check', ('filename', 'line', 'column'), 'error_code', 'error_text')
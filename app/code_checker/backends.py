@@ -0,0 +1,243 @@
+import json
+import os
+import shutil
+import subprocess  # nosec B404
+import sys
+from collections import defaultdict
+from functools import cached_property, lru_cache
+
+import pycodestyle
+import pyflakes
+from django.conf import settings
+from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+from pyflakes.checker import Checker as PyflakesChecker
+
+from code_checker.base_backend import CheckBackend, CheckBackendUnavailableError
+from code_checker.engine import get_flake8_engine
+from code_checker.sources import SourceFile
+
+
+class Flake8SubprocessBackend(CheckBackend):
+    """Runs the flake8 command line, one subprocess checks all files of the batch."""
+
+    name = 'flake8_subprocess'
+
+    @cached_property
+    def fingerprint(self):
+        """The same fingerprint as the in-process flake8, both read the same configuration and give the same result."""
+        return get_flake8_engine().fingerprint
+
+    @property
+    def version(self):
+        """Versions of flake8 and its plugins."""
+        return get_flake8_engine().version
+
+    def check_files(self, file_paths, sources=None):
+        """Check files with a flake8 subprocess."""
+        file_paths = [str(file_path) for file_path in file_paths]
+        completed = subprocess.run(  # nosec B603, the arguments are paths of the uploaded files
+            [sys.executable, '-m', 'flake8', *file_paths],
+            capture_output=True,
+            text=True,
+            timeout=settings.CODE_CHECKER_TIMEOUT * len(file_paths),
+        )
+
+        if completed.returncode not in {0, 1}:
+            return {file_path: (completed.returncode, '', completed.stderr) for file_path in file_paths}
+
+        return _split_report_lines(file_paths=file_paths, lines=completed.stdout.splitlines(keepends=True))
+
+
+class PycodestylePyflakesBackend(CheckBackend):
+    """
+    Runs pycodestyle and pyflakes directly over the shared lines and AST of the file, without the flake8 plugins.
+
+    The result has the flake8 codes of the two tools, the checks of the other flake8 plugins are not run.
+    """
+
+    name = 'pycodestyle_pyflakes'
+
+    def __init__(self):
+        self._style_options = pycodestyle.StyleGuide(quiet=True).options
+
+    @property
+    def version(self):
+        """Versions of pycodestyle and pyflakes."""
+        return f'{pycodestyle.__version__}|{pyflakes.__version__}'
+
+    def check_files(self, file_paths, sources=None):
+        """Check files with pycodestyle and pyflakes."""
+        sources = sources or {}
+        results = {}
+
+        for file_path in map(str, file_paths):
+            source = sources.get(file_path) or SourceFile(file_path)
+
+            try:
+                errors = self._check_source(source=source)
+            except OSError as e:
+                errors = [(0, 1, 'E902', f'{type(e).__name__}: {e}')]
+
+            lines = [f'{file_path}:{row}:{column}: {code} {text}\n' for row, column, code, text in sorted(errors)]
+            results[file_path] = (int(bool(lines)), ''.join(lines), '')
+
+        return results
+
+    def _check_source(self, source):
+        """
+        Check the source with both tools.
+
+        Args:
+            source: SourceFile of the checked file.
+
+        Returns:
+            A list of tuples with the line, column, error code and error text.
+        """
+        try:
+            tree = source.tree
+        except SyntaxError as e:
+            return [(e.lineno or 1, e.offset or 1, 'E999', f'{type(e).__name__}: {e.msg}')]
+
+        report = _CollectingReport(options=self._style_options)
+        pycodestyle.Checker(
+            source.file_path,
+            lines=list(source.lines),
+            options=self._style_options,
+            report=report,
+        ).check_all()
+
+        pyflakes_errors = [
+            (
+                message.lineno,
+                message.col + 1,
+                FLAKE8_PYFLAKES_CODES.get(type(message).__name__, 'F999'),
+                message.message % message.message_args,
+            )
+            for message in PyflakesChecker(tree, filename=source.file_path).messages
+        ]
+
+        return report.errors + pyflakes_errors
+
+
+class RuffBackend(CheckBackend):
+    """Runs the ruff binary found on the host, one subprocess checks all files of the batch."""
+
+    name = 'ruff'
+
+    def __init__(self):
+        self._executable = shutil.which('ruff')
+
+        if not self._executable:
+            raise CheckBackendUnavailableError('ruff executable is not found')
+
+    @cached_property
+    def version(self):
+        """Version of the ruff binary."""
+        return subprocess.run(  # nosec B603, the path is found by shutil.which
+            [self._executable, '--version'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    def check_files(self, file_paths, sources=None):
+        """Check files with ruff."""
+        file_paths = [str(file_path) for file_path in file_paths]
+        completed = subprocess.run(  # nosec B603, the arguments are paths of the uploaded files
+            [self._executable, 'check', '--no-cache', '--output-format=json', '--exit-zero', *file_paths],
+            capture_output=True,
+            text=True,
+            timeout=settings.CODE_CHECKER_TIMEOUT * len(file_paths),
+        )
+
+        if completed.returncode != 0:
+            return {file_path: (completed.returncode, '', completed.stderr) for file_path in file_paths}
+
+        # ruff reports absolute paths, the report lines keep the paths as they were given
+        paths_by_filename = {os.path.abspath(file_path): file_path for file_path in file_paths}
+        lines = [
+            f"{paths_by_filename.get(message['filename'], message['filename'])}:"
+            f"{message['location']['row']}:{message['location']['column']}: "
+            f"{message['code'] or 'E999'} {message['message']}\n"
+            for message in json.loads(completed.stdout or '[]')
+        ]
+
+        return _split_report_lines(file_paths=file_paths, lines=lines)
+
+
+class _CollectingReport(pycodestyle.BaseReport):
+    """pycodestyle report keeping the errors instead of printing them."""
+
+    def init_file(self, filename, lines, expected, line_offset):
+        """Start the report of a new file."""
+        self.errors = []
+
+        return super().init_file(filename, lines, expected, line_offset)
+
+    def error(self, line_number, offset, text, check):
+        """Keep the error if it isn't ignored by the options."""
+        code = super().error(line_number, offset, text, check)
+
+        if code:
+            self.errors.append((line_number, offset + 1, code, text[5:]))
+
+        return code
+
+
+CHECK_BACKENDS = {
+    'flake8': get_flake8_engine,
+    'flake8_subprocess': Flake8SubprocessBackend,
+    'pycodestyle_pyflakes': PycodestylePyflakesBackend,
+    'ruff': RuffBackend,
+}
+
+
+def get_check_backend(name=None):
+    """
+    Return the checker backend of the current process, creating it on the first call.
+
+    Args:
+        name: Name of the backend, the CODE_CHECKER_BACKEND setting by default.
+
+    Returns:
+        The checker backend.
+
+    Raises:
+        CheckBackendUnavailableError: If the backend is unknown or can't run on this host.
+    """
+    name = name or settings.CODE_CHECKER_BACKEND
+
+    if name not in CHECK_BACKENDS:
+        raise CheckBackendUnavailableError(f'Unknown checker backend {name!r}, known: {", ".join(CHECK_BACKENDS)}')
+
+    return _create_check_backend(name=name)
+
+
+@lru_cache(maxsize=None)
+def _create_check_backend(name):
+    """Create the checker backend once per process."""
+    return CHECK_BACKENDS[name]()
+
+
+def _split_report_lines(file_paths, lines):
+    """
+    Split report lines of several files into the results of every file.
+
+    Args:
+        file_paths: Paths to the checked files.
+        lines: Report lines starting with the path of the file.
+
+    Returns:
+        A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+    """
+    file_lines = defaultdict(list)
+
+    for line in lines:
+        file_path = next((file_path for file_path in file_paths if line.startswith(f'{file_path}:')), None)
+
+        if file_path:
+            file_lines[file_path].append(line)
+
+    return {
+        file_path: (int(bool(file_lines[file_path])), ''.join(file_lines[file_path]), '') for file_path in file_paths
+    }
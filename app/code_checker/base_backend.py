@@ -0,0 +1,50 @@
+import hashlib
+from abc import ABC, abstractmethod
+from functools import cached_property
+
+
+class CheckBackendUnavailableError(Exception):
+    """The checker backend can't run on this host."""
+
+
+class CheckBackend(ABC):
+    """
+    Base class of the checker backends.
+
+    Every backend returns the normalized result: a tuple with the return code, the report lines in the flake8
+    `path:line:column: code text` format and stderr for every file.
+    """
+
+    name = ''
+
+    @cached_property
+    def fingerprint(self):
+        """Hash of the backend name and version that define the check result."""
+        return hashlib.sha256(f'{self.name}|{self.version}'.encode()).hexdigest()
+
+    @property
+    @abstractmethod
+    def version(self):
+        """Version of the checker tools."""
+
+    @abstractmethod
+    def check_files(self, file_paths, sources=None):
+        """
+        Check several files.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: A dict with the file path as a key and its SourceFile as a value, other files are read again.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+
+    def preflight_file(self, file_path, source=None):
+        """
+        Report a broken file without the full check, the backends without a preflight check leave every file to it.
+
+        Returns:
+            A tuple with the return code, stdout and stderr for a broken file, None if the file needs the full check.
+        """
+        return None
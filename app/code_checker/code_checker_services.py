@@ -1,35 +1,116 @@
 import logging
 from collections import namedtuple
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 from django.conf import settings
-from django.db.models import Prefetch
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from code_checker.models import CheckLog, CodeCheck, CodeCheckStatus
-from code_checker.utils import run_flake8
+from code_checker.backends import CheckBackendUnavailableError
+from code_checker.dirty_files import forget_dirty_files, mark_files_dirty
+from code_checker.executors import get_check_executor
+from code_checker.models import CheckLog, CheckViolation, CodeCheck, CodeCheckStatus
+from code_checker.result_cache import cache_results, get_cached_results
+from code_checker.sources import SourceFile
+from code_checker.utils import CHECK_TIMEOUT_RETURN_CODE, get_failed_results, parse_flake8_output
 from code_files.models import FileState, UploadedFile
-from users.models import User
 
 logger = logging.getLogger(__name__)
 
+CheckResult = namedtuple('CheckResult', 'checked_files, code_check_objects_id')
+Notification = namedtuple('Notification', 'message, code_check_objects_id')
 
-def get_users_files_with_new_or_overwritten_state():
+
+def get_files_with_new_or_overwritten_state():
+    """
+    Retrieve IDs of uploaded files that have a new or overwritten state.
+
+    Files are checked right after the upload, so files uploaded less than CODE_CHECKER_SWEEP_DELAY seconds ago
+    are left to that check. Quarantined files and files waiting for the next attempt of a failed check are skipped.
+
+    Returns:
+        A queryset containing IDs of the files with new or overwritten state.
+    """
+    now = timezone.now()
+    uploaded_before = now - timedelta(seconds=settings.CODE_CHECKER_SWEEP_DELAY)
+
+    return (
+        UploadedFile.objects.filter(
+            state__in=[FileState.NEW.value, FileState.OVERWRITTEN.value],
+            uploaded_at__lte=uploaded_before,
+        )
+        .exclude(codecheck__status=CodeCheckStatus.QUARANTINED.value)
+        .exclude(codecheck__next_attempt_at__gt=now)
+        .values_list('pk', flat=True)
+    )
+
+
+def group_files_by_user(file_ids):
+    """
+    Group files that are still waiting for the check by the email of their owner.
+
+    Args:
+        file_ids: IDs of the uploaded files.
+
+    Yields:
+        A tuple with the user email and a list of IDs of the user files, rows are streamed from the database.
+    """
+    files = (
+        UploadedFile.objects.filter(
+            pk__in=file_ids,
+            state__in=[FileState.NEW.value, FileState.OVERWRITTEN.value],
+        )
+        .order_by('user', 'pk')
+        .values_list('user__email', 'pk')
+        .iterator(chunk_size=settings.CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE)
+    )
+
+    for user_email, user_files in groupby(files, key=itemgetter(0)):
+        yield user_email, [file_id for _, file_id in user_files]
+
+
+def claim_code_checks(uploaded_files):
     """
-    Retrieve a list of users along with their uploaded files that have a new or overwritten state.
+    Claim unchecked code checks of the files, so that parallel workers never process the same file twice.
+
+    Rows locked by another worker are skipped. Checks left in checking by a lost worker are claimed again
+    after the lease timeout. Failed checks are claimed again when their next attempt is due.
+
+    Args:
+        uploaded_files: A list of uploaded file objects.
 
     Returns:
-        A queryset containing users and their filtered files with new or overwritten state.
+        A list of claimed code check objects with related files.
     """
-    users_with_files = User.objects.prefetch_related(
-        Prefetch(
-            'uploadedfile_set',
-            queryset=UploadedFile.objects.filter(state__in=[FileState.NEW.value, FileState.OVERWRITTEN.value]),
-            to_attr='filtered_files',
-        ),
-    ).distinct()
+    claimed_at = timezone.now()
+    lease_expired_at = claimed_at - timedelta(seconds=settings.CODE_CHECKER_LEASE_TIMEOUT)
+
+    lease_expired = Q(claimed_at__isnull=True) | Q(claimed_at__lt=lease_expired_at)
+    retry_is_due = Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=claimed_at)
+    is_claimable = Q(retry_is_due, status=CodeCheckStatus.UNCHECKED.value) | Q(
+        lease_expired,
+        status=CodeCheckStatus.IN_CHECKING.value,
+    )
+
+    with transaction.atomic():
+        code_checks = list(
+            CodeCheck.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                is_claimable,
+                file__in=uploaded_files,
+            ).select_related('file'),
+        )
+
+        CodeCheck.objects.filter(pk__in=[code_check.pk for code_check in code_checks]).update(
+            is_notified=False,
+            status=CodeCheckStatus.IN_CHECKING.value,
+            claimed_at=claimed_at,
+        )
 
-    return users_with_files
+    return code_checks
 
 
 def check_user_files(uploaded_files):
@@ -40,59 +121,230 @@ def check_user_files(uploaded_files):
         uploaded_files: A list of uploaded file objects.
 
     Returns:
-        A named tuple with the fields 'message' and 'code_check_objects_id'.
+        A named tuple with the fields 'checked_files' and 'code_check_objects_id'.
 
-            message: Email message containing information about the code check.
+            checked_files: List of names of the checked files, failed checks are retried later and not listed.
             code_check_objects_id: List of IDs of code check objects.
     """
-    result = namedtuple('CheckResult', 'message, code_check_objects_id')
-
     checked_files = []
     code_checker_objects = []
 
-    code_checks_to_process = CodeCheck.objects.filter(
-        file__in=uploaded_files,
-        status__in=[CodeCheckStatus.UNCHECKED.value, CodeCheckStatus.IN_CHECKING.value],
-    )
+    code_checks_to_process = claim_code_checks(uploaded_files=uploaded_files)
 
-    for code_check_obj in code_checks_to_process:
+    if not code_checks_to_process:
+        return CheckResult(checked_files=checked_files, code_check_objects_id=code_checker_objects)
 
-        code_check_obj.is_notified = False
-        code_check_obj.status = CodeCheckStatus.IN_CHECKING.value
-        code_check_obj.save()
+    files_to_check = {}
 
-        code_checker_objects.append(code_check_obj.id)
+    for code_check_obj in code_checks_to_process:
+        code_check_obj.is_notified = False
 
         absolute_file_path, file_name = _generate_path_to_user_file(file_obj=code_check_obj.file)
         logger.info(f'Work with file: {absolute_file_path=}')
 
-        return_code, stdout_, stderr_ = run_flake8(file_path=absolute_file_path)
-        checked_files.append(file_name)
+        files_to_check[code_check_obj] = (str(absolute_file_path), file_name)
 
-        CheckLog.objects.create(
-            code_check=code_check_obj,
-            log_text=f'Code check for file {file_name} with state {code_check_obj.file.state} is done!',
-        )
+    file_paths = [file_path for file_path, _ in files_to_check.values()]
+
+    try:
+        check_results = _run_flake8_with_cache(file_paths=file_paths)
+    except CheckBackendUnavailableError as e:
+        # The claimed checks are failed, so they are retried and quarantined instead of waiting for the lease
+        logger.error(f'Checker backend is unavailable: {e}')
+        check_results = get_failed_results(file_paths=file_paths, error=e)
+
+    check_logs = []
+    check_violations = []
+    checked_file_ids = []
+    quarantined_file_ids = []
+    retry_files = {}
+    done_code_check_ids = []
+    check_timestamp = timezone.now()
+
+    for code_check_obj, (absolute_file_path, file_name) in files_to_check.items():
+        return_code, stdout_, stderr_ = check_results[absolute_file_path]
 
         if not stderr_:
             logger.debug(f'Result run_flake8 return_code: {return_code}')
             logger.debug(f'Result run_flake8 stdout: {stdout_}')
 
-            code_check_obj.status = CodeCheckStatus.DONE.value
-            code_check_obj.timestamp = timezone.now()
-            code_check_obj.last_check_result = stdout_
+            checked_files.append(file_name)
+            code_checker_objects.append(code_check_obj.id)
+            check_logs.append(
+                CheckLog(
+                    code_check=code_check_obj,
+                    log_text=(
+                        f'Code check for file {file_name} with state {code_check_obj.file.get_state_display()} '
+                        'is done!'
+                    ),
+                ),
+            )
 
-            code_check_obj.file.state = FileState.OLD.value
+            code_check_obj.status = CodeCheckStatus.DONE.value
+            code_check_obj.timestamp = check_timestamp
+            code_check_obj.last_check_result = stdout_ or CodeCheck.WITHOUT_PROBLEMS
+            code_check_obj.attempts = 0
+            code_check_obj.next_attempt_at = None
+
+            checked_file_ids.append(code_check_obj.file_id)
+            done_code_check_ids.append(code_check_obj.id)
+            check_violations.extend(
+                CheckViolation(
+                    code_check=code_check_obj,
+                    filename=file_name,
+                    line=line,
+                    column=column,
+                    error_code=error_code,
+                    error_text=error_text,
+                )
+                for line, column, error_code, error_text in parse_flake8_output(output=stdout_)
+            )
         else:
             logger.debug(f'Result run_flake8 stderr: {stderr_}')
-            code_check_obj.status = CodeCheckStatus.UNCHECKED.value
+            _schedule_retry(code_check_obj=code_check_obj, failed_at=check_timestamp)
+
+            check_logs.append(
+                CheckLog(
+                    code_check=code_check_obj,
+                    log_text=(
+                        f'Code check for file {file_name} {_describe_failure(return_code=return_code)}, '
+                        f'attempt {code_check_obj.attempts}, '
+                        f'status {code_check_obj.get_status_display()}'
+                    ),
+                ),
+            )
+
+            if code_check_obj.status == CodeCheckStatus.QUARANTINED.value:
+                logger.warning(f'Code check for file {file_name} is quarantined after {code_check_obj.attempts} fails')
+                quarantined_file_ids.append(code_check_obj.file_id)
+            else:
+                retry_files[code_check_obj.file_id] = code_check_obj.next_attempt_at
+
+    with transaction.atomic():
+        CheckLog.objects.bulk_create(check_logs)
+        CodeCheck.objects.bulk_update(
+            code_checks_to_process,
+            fields=['status', 'timestamp', 'last_check_result', 'is_notified', 'attempts', 'next_attempt_at'],
+        )
+        UploadedFile.objects.filter(pk__in=checked_file_ids).update(state=FileState.OLD.value)
+        CheckViolation.objects.filter(code_check__in=done_code_check_ids).delete()
+        CheckViolation.objects.bulk_create(check_violations)
+        transaction.on_commit(
+            lambda: _update_dirty_files(
+                checked_file_ids=checked_file_ids + quarantined_file_ids,
+                retry_files=retry_files,
+            ),
+        )
+
+    return CheckResult(checked_files=checked_files, code_check_objects_id=code_checker_objects)
+
+
+def generate_notification(check_results):
+    """
+    Merge results of several file checks of one user into one email notification.
+
+    Args:
+        check_results: A list of pairs with checked file names and IDs of code check objects.
+
+    Returns:
+        A named tuple with the fields 'message' and 'code_check_objects_id' or None if nothing was checked.
+
+            message: Email message containing information about the code check.
+            code_check_objects_id: List of IDs of code check objects.
+    """
+    checked_files = []
+    code_check_objects_id = []
+
+    for files, code_check_ids in check_results:
+        checked_files.extend(files)
+        code_check_objects_id.extend(code_check_ids)
+
+    if not checked_files:
+        return None
+
+    return Notification(
+        message=_generate_message_for_email(files=checked_files),
+        code_check_objects_id=code_check_objects_id,
+    )
+
+
+def _describe_failure(return_code):
+    """
+    Describe the outcome of a failed check for the check log.
+
+    Args:
+        return_code: Return code of the failed check.
+
+    Returns:
+        'timed out' for checks stopped by the time limit and 'failed' for the rest.
+    """
+    return 'timed out' if return_code == CHECK_TIMEOUT_RETURN_CODE else 'failed'
+
+
+def _schedule_retry(code_check_obj, failed_at):
+    """
+    Count a failed check attempt and plan the next one with exponential backoff.
+
+    After CODE_CHECKER_MAX_ATTEMPTS fails the check is quarantined and isn't retried until the file is uploaded again.
+
+    Args:
+        code_check_obj: The failed code check object.
+        failed_at: Time of the failed attempt.
+    """
+    code_check_obj.attempts += 1
+
+    if code_check_obj.attempts >= settings.CODE_CHECKER_MAX_ATTEMPTS:
+        code_check_obj.status = CodeCheckStatus.QUARANTINED.value
+        code_check_obj.next_attempt_at = None
+    else:
+        retry_delay = settings.CODE_CHECKER_RETRY_DELAY * 2 ** (code_check_obj.attempts - 1)
+
+        code_check_obj.status = CodeCheckStatus.UNCHECKED.value
+        code_check_obj.next_attempt_at = failed_at + timedelta(seconds=retry_delay)
+
+
+def _update_dirty_files(checked_file_ids, retry_files):
+    """
+    Forget the dirty files that need no more checks and mark failed files dirty again for their next attempt.
+
+    Args:
+        checked_file_ids: IDs of the checked or quarantined files.
+        retry_files: A dict with the file ID as a key and the time of its next attempt as a value.
+    """
+    forget_dirty_files(file_ids=checked_file_ids)
+
+    for file_id, next_attempt_at in retry_files.items():
+        mark_files_dirty(file_ids=[file_id], marked_at=next_attempt_at)
+
+
+def _run_flake8_with_cache(file_paths):
+    """
+    Check files with flake8, taking results for already known file contents from the cache.
+
+    Files missed in the cache are checked by the executor selected by the CODE_CHECKER_EXECUTOR setting.
+    Every file is read once in the worker for its content hash, it's parsed only in the limited check process,
+    where the preflight check and the flake8 check share its SourceFile.
+
+    Args:
+        file_paths: A list of absolute paths to the files.
+
+    Returns:
+        A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+    """
+    sources = {file_path: SourceFile(file_path) for file_path in file_paths}
+    content_hashes = {file_path: source.content_hash for file_path, source in sources.items()}
+    check_results = get_cached_results(
+        content_hashes={file_path: content_hash for file_path, content_hash in content_hashes.items() if content_hash},
+    )
 
-        code_check_obj.save()
-        code_check_obj.file.save()
+    files_to_lint = [file_path for file_path in file_paths if file_path not in check_results]
 
-    messages_for_email = _generate_message_for_email(files=checked_files)
+    if files_to_lint:
+        lint_results = get_check_executor().check_files(file_paths=files_to_lint, sources=sources)
+        cache_results(results=lint_results, content_hashes=content_hashes)
+        check_results.update(lint_results)
 
-    return result(message=messages_for_email, code_check_objects_id=code_checker_objects)
+    return check_results
 
 
 def _generate_path_to_user_file(file_obj):
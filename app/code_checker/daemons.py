@@ -0,0 +1,254 @@
+import logging
+import os
+import resource
+import signal
+import time
+from collections import deque
+from functools import lru_cache
+from multiprocessing.connection import Pipe, wait
+
+from django.conf import settings
+
+from code_checker.backends import get_check_backend
+from code_checker.isolation import IsolatedRunError, IsolatedRunTimeoutError, get_address_space_size
+from code_checker.utils import check_files_with_output_cap, get_failed_results
+
+logger = logging.getLogger(__name__)
+
+
+class CheckDaemon:
+    """
+    A long-lived child process checking files with the checker backend loaded by the worker before the fork.
+
+    The daemon gets a list of file paths over a Unix socket pair and sends back the results of the files,
+    it exits when the socket is closed by the worker.
+    """
+
+    def __init__(self, engine, memory_limit, max_output_size, siblings=()):
+        parent_connection, child_connection = Pipe()
+        self.pid = os.fork()
+
+        if self.pid == 0:
+            parent_connection.close()
+
+            # Sockets of the other daemons must be closed only by the worker, otherwise they never see the end of file
+            for sibling in siblings:
+                sibling.connection.close()
+
+            _serve(
+                connection=child_connection,
+                engine=engine,
+                memory_limit=memory_limit,
+                max_output_size=max_output_size,
+            )
+
+        child_connection.close()
+        self.connection = parent_connection
+        self.checked_files_count = 0
+        self.is_broken = False
+        self._file_path = None
+        self._timeout = None
+        self._deadline = None
+
+    @property
+    def time_left(self):
+        """Seconds left until the wall-clock limit of the current check."""
+        return self._deadline - time.monotonic()
+
+    def send(self, file_path, timeout):
+        """
+        Send a file for checking.
+
+        Args:
+            file_path: Path to the file for checking.
+            timeout: Wall-clock limit of the check in seconds.
+        """
+        self._file_path = file_path
+        self._timeout = timeout
+        self._deadline = time.monotonic() + timeout
+        self.checked_files_count += 1
+        self.connection.send([file_path])
+
+    def receive(self):
+        """
+        Receive the result of the current check, the daemon is broken if it died.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        try:
+            is_success, result = self.connection.recv()
+        except (EOFError, OSError):
+            self.is_broken = True
+            return get_failed_results(file_paths=[self._file_path], error=IsolatedRunError('Check daemon died'))
+
+        if not is_success:
+            return get_failed_results(file_paths=[self._file_path], error=IsolatedRunError(result))
+
+        return result
+
+    def kill_on_timeout(self):
+        """
+        Kill the daemon whose check didn't finish in the wall-clock limit.
+
+        Returns:
+            A dict with the timeout result of the current file.
+        """
+        os.kill(self.pid, signal.SIGKILL)
+        self.is_broken = True
+        error = IsolatedRunTimeoutError(f'Wall-clock limit of {self._timeout} seconds is exceeded')
+
+        return get_failed_results(file_paths=[self._file_path], error=error)
+
+    def stop(self):
+        """Close the socket, so the daemon exits, and reap it."""
+        if self.is_broken:
+            os.kill(self.pid, signal.SIGKILL)
+
+        self.connection.close()
+        os.waitpid(self.pid, 0)
+
+
+class CheckDaemonPool:
+    """
+    A pool of check daemons of the worker process.
+
+    Every file is sent to a free daemon, so the daemons check the files of a task at the same time without
+    loading flake8 for every check. A daemon that died or ran out of time is replaced, and a daemon is also
+    restarted after `max_files` checked files to bound its memory growth.
+    """
+
+    def __init__(self, size, max_files):
+        self.size = size
+        self.max_files = max_files
+        self._idle_daemons = []
+
+    def check_files(self, file_paths, sources=None):
+        """
+        Check files with the daemons, every file gets the CODE_CHECKER_TIMEOUT wall-clock limit.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: Not used, the daemons are forked before the files are read and read them again.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        timeout = settings.CODE_CHECKER_TIMEOUT
+        pending_file_paths = deque(str(file_path) for file_path in file_paths)
+        busy_daemons = {}
+        results = {}
+
+        try:
+            while pending_file_paths or busy_daemons:
+                while pending_file_paths and (self._idle_daemons or len(busy_daemons) < self.size):
+                    daemon = self._idle_daemons.pop() if self._idle_daemons else self._start_daemon(busy_daemons)
+                    daemon.send(file_path=pending_file_paths.popleft(), timeout=timeout)
+                    busy_daemons[daemon.connection] = daemon
+
+                time_left = min(daemon.time_left for daemon in busy_daemons.values())
+
+                for connection in wait(list(busy_daemons), timeout=max(time_left, 0)):
+                    daemon = busy_daemons.pop(connection)
+                    results.update(daemon.receive())
+                    self._release_daemon(daemon)
+
+                for connection, daemon in list(busy_daemons.items()):
+                    if daemon.time_left <= 0:
+                        del busy_daemons[connection]
+                        results.update(daemon.kill_on_timeout())
+                        self._release_daemon(daemon)
+        finally:
+            # Daemons left busy by an exception are in an unknown state
+            for daemon in busy_daemons.values():
+                daemon.is_broken = True
+                daemon.stop()
+
+        return results
+
+    def close(self):
+        """Stop all idle daemons."""
+        while self._idle_daemons:
+            self._idle_daemons.pop().stop()
+
+    def _start_daemon(self, busy_daemons):
+        """
+        Start a new daemon from the worker with the loaded checker backend.
+
+        Args:
+            busy_daemons: Daemons checking files right now, their sockets are closed in the new daemon.
+
+        Returns:
+            A new CheckDaemon.
+        """
+        logger.info('Start check daemon')
+
+        return CheckDaemon(
+            engine=get_check_backend(),
+            memory_limit=settings.CODE_CHECKER_MEMORY_LIMIT,
+            max_output_size=settings.CODE_CHECKER_MAX_OUTPUT_SIZE,
+            siblings=[*self._idle_daemons, *busy_daemons.values()],
+        )
+
+    def _release_daemon(self, daemon):
+        """
+        Return the daemon to the idle daemons, or stop it if it is broken or has checked too many files.
+
+        Args:
+            daemon: The daemon that finished its check.
+        """
+        if daemon.is_broken or daemon.checked_files_count >= self.max_files:
+            daemon.stop()
+        else:
+            self._idle_daemons.append(daemon)
+
+
+@lru_cache(maxsize=None)
+def get_check_daemon_pool(size, max_files):
+    """
+    Return the check daemon pool of the current process, creating it on the first call.
+
+    Args:
+        size: Maximum number of daemons.
+        max_files: Number of files after which a daemon is restarted.
+
+    Returns:
+        A CheckDaemonPool.
+    """
+    return CheckDaemonPool(size=size, max_files=max_files)
+
+
+def _serve(connection, engine, memory_limit, max_output_size):
+    """
+    Check the files sent by the worker until the socket is closed, never returns.
+
+    Args:
+        connection: The daemon end of the socket pair.
+        engine: The checker backend loaded by the worker.
+        memory_limit: Bytes of address space the daemon may allocate on top of the worker, 0 for no limit.
+        max_output_size: Maximum size of the output of one file in characters.
+    """
+    exit_code = 1
+
+    try:
+        if memory_limit:
+            address_space = get_address_space_size() + memory_limit
+            resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
+
+        while True:
+            try:
+                file_paths = connection.recv()
+            except EOFError:
+                break
+
+            try:
+                response = (True, check_files_with_output_cap(engine, file_paths, max_output_size))
+            except Exception as e:
+                response = (False, f'{type(e).__name__}: {e}')
+
+            connection.send(response)
+
+        exit_code = 0
+    finally:
+        # The daemon must never return into the code of the worker
+        os._exit(exit_code)
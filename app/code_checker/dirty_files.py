@@ -0,0 +1,73 @@
+import logging
+
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of uploaded file ids waiting for the check, the score is the time the file was marked dirty
+DIRTY_FILES_KEY = 'code_checker:dirty_files'
+
+# Takes at most ARGV[2] file ids marked not later than ARGV[1] and removes them from the set in one step
+POP_DUE_FILES_SCRIPT = """
+local file_ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #file_ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(file_ids))
+end
+return file_ids
+"""
+
+
+def mark_files_dirty(file_ids, marked_at=None):
+    """
+    Add files to the set of files waiting for the check.
+
+    Redis errors are only logged, the files are still found by the reconciliation task.
+
+    Args:
+        file_ids: IDs of the uploaded files.
+        marked_at: Time the files are marked dirty, now by default.
+    """
+    if not file_ids:
+        return
+
+    score = (marked_at or timezone.now()).timestamp()
+
+    try:
+        get_redis_connection().zadd(DIRTY_FILES_KEY, dict.fromkeys(file_ids, score))
+    except RedisError:
+        logger.exception(f'Files {file_ids} are not marked dirty')
+
+
+def pop_due_dirty_files(count, due_before):
+    """
+    Take files marked dirty earlier than the given time out of the set.
+
+    Args:
+        count: Maximum number of files to take.
+        due_before: Only files marked dirty not later than this time are taken.
+
+    Returns:
+        A list with IDs of the uploaded files.
+    """
+    pop_due_files = get_redis_connection().register_script(POP_DUE_FILES_SCRIPT)
+    file_ids = pop_due_files(keys=[DIRTY_FILES_KEY], args=[due_before.timestamp(), count])
+
+    return [int(file_id) for file_id in file_ids]
+
+
+def forget_dirty_files(file_ids):
+    """
+    Remove checked files from the set of files waiting for the check.
+
+    Args:
+        file_ids: IDs of the uploaded files.
+    """
+    if not file_ids:
+        return
+
+    try:
+        get_redis_connection().zrem(DIRTY_FILES_KEY, *file_ids)
+    except RedisError:
+        logger.exception(f'Checked files {file_ids} are not removed from dirty files')
@@ -0,0 +1,243 @@
+import hashlib
+import io
+import logging
+import operator
+from functools import cached_property, lru_cache
+
+# The engine relies on flake8 internals that aren't part of its public API and change between minor versions:
+# FileChecker._extract_syntax_information and _make_processor, Application.make_file_checker_manager(argv) and
+# Manager.results. flake8 is pinned to ~6.1.0 in pyproject.toml for them, check them before raising the pin.
+import flake8
+from flake8.checker import FileChecker
+from flake8.main.application import Application
+from flake8.processor import FileProcessor
+
+from code_checker.base_backend import CheckBackend
+from code_checker.sources import SourceFile
+
+logger = logging.getLogger(__name__)
+
+
+class Flake8Engine(CheckBackend):
+    """
+    In-process flake8 checker.
+
+    Plugin discovery and option parsing happen once in the constructor; every run reuses the loaded
+    plugins and only builds a fresh style guide and checker manager.
+    """
+
+    name = 'flake8'
+
+    def __init__(self, argv=()):
+        self._argv = list(argv)
+        self._app = Application()
+        self._app.initialize(self._argv)
+
+    @cached_property
+    def fingerprint(self):
+        """Hash of the flake8 version, installed plugins and parsed options that define the check result."""
+        options = sorted(
+            (name, repr(value)) for name, value in vars(self._app.options).items() if name != 'filenames'
+        )
+        toolchain = f'{self.version}|{options}'
+
+        return hashlib.sha256(toolchain.encode()).hexdigest()
+
+    @property
+    def version(self):
+        """Versions of flake8 and its plugins."""
+        return f'{flake8.__version__}|{self._app.plugins.versions_str()}'
+
+    def check_file(self, file_path):
+        """
+        Check a single file with the preloaded flake8 application.
+
+        Args:
+            file_path: Path to the file for checking.
+
+        Returns:
+            A tuple with the return code, stdout and stderr, the same as the flake8 command line returns.
+        """
+        return self.check_files(file_paths=[file_path])[str(file_path)]
+
+    def check_files(self, file_paths, sources=None):
+        """
+        Check several files in one flake8 run.
+
+        The files are checked one after another in the current process, parallel checks are run by the code checker
+        executors. All plugins of a file share its lines, tokens and AST, the output is reported separately
+        for every file.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: A dict with the file path as a key and its SourceFile as a value, other files are read again.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        app = self._app
+        file_names = [str(file_path) for file_path in file_paths]
+        sources = sources or {}
+
+        # A new guide and manager per run keep statistics and per-file caches from growing over the worker life.
+        app.make_guide()
+        app.make_file_checker_manager(self._argv)
+        app.options.filenames = file_names
+
+        manager = app.file_checker_manager
+        manager.start()
+        manager.results = [
+            SharedSourceFileChecker(
+                filename=file_name,
+                plugins=manager.plugins,
+                options=manager.options,
+                source=sources.get(file_name) or SourceFile(file_name),
+            ).run_checks()
+            for file_name in manager.filenames
+        ]
+
+        checked_files = dict.fromkeys(file_names, (0, '', ''))
+
+        for file_name, results, _ in manager.results:
+            checked_files[file_name] = self._report_file(file_name=file_name, results=results)
+
+        return checked_files
+
+    def preflight_file(self, file_path, source=None):
+        """
+        Read and parse the file the same way flake8 does, without running the plugins.
+
+        A file that can't be read or parsed gets only the E902 or E999 error from the full flake8 run,
+        so the error is reported right away.
+
+        Args:
+            file_path: Path to the file for checking.
+            source: SourceFile of the file, the parsed file is kept in it for the full check.
+
+        Returns:
+            A tuple with the return code, stdout and stderr for a broken file, None if the file needs the full check.
+        """
+        file_name = str(file_path)
+
+        try:
+            file_processor = SharedSourceFileProcessor(
+                file_name,
+                self._app.options,
+                source=source or SourceFile(file_name),
+            )
+        except OSError as e:
+            return self._report_file(file_name=file_name, results=[('E902', 0, 0, f'{type(e).__name__}: {e}', None)])
+
+        if file_processor.should_ignore_file():
+            return None
+
+        try:
+            file_processor.build_ast()
+        except SyntaxError as e:
+            row, column = FileChecker._extract_syntax_information(e)
+            error_text = f'{type(e).__name__}: {e.args[0]}'
+
+            return self._report_file(
+                file_name=file_name,
+                results=[('E999', row, column, error_text, file_processor.noqa_line_for(row))],
+            )
+
+        return None
+
+    def _report_file(self, file_name, results):
+        """
+        Format flake8 results of one file the same way the command line does.
+
+        Args:
+            file_name: Name of the checked file.
+            results: Raw results of the flake8 file checker.
+
+        Returns:
+            A tuple with the return code, stdout and stderr for the file.
+        """
+        app = self._app
+        output = io.StringIO()
+        reported_count = 0
+
+        app.formatter.output_fd = output
+
+        try:
+            with app.guide.processing_file(file_name):
+                for error_code, line_number, column, text, physical_line in sorted(
+                    results,
+                    key=operator.itemgetter(1, 2),
+                ):
+                    reported_count += app.guide.handle_error(
+                        code=error_code,
+                        filename=file_name,
+                        line_number=line_number,
+                        column_number=column,
+                        text=text,
+                        physical_line=physical_line,
+                    )
+        finally:
+            app.formatter.output_fd = None
+
+        return_code = 0 if app.options.exit_zero else int(reported_count > 0)
+
+        return return_code, output.getvalue(), ''
+
+
+class SharedSourceFileProcessor(FileProcessor):
+    """flake8 file processor taking the lines, tokens and AST of the file from its SourceFile."""
+
+    def __init__(self, filename, options, source):
+        self._source = source
+        super().__init__(filename, options, lines=list(source.lines))
+
+    @property
+    def file_tokens(self):
+        """Return the complete set of tokens for a file."""
+        return list(self._source.tokens)
+
+    def build_ast(self):
+        """Return the abstract syntax tree of the file."""
+        return self._source.tree
+
+    def generate_tokens(self):
+        """
+        Yield the tokens of the file, moving through the lines the same way tokenizing them would.
+
+        Yields:
+            The tokens of the file.
+        """
+        for token in self._source.tokens:
+            if token.start[0] > self.total_lines:
+                break
+
+            while self.line_number < min(token.end[0], self.total_lines):
+                self.next_line()
+
+            self.tokens.append(token)
+            yield token
+
+    def strip_utf_bom(self):
+        """Keep the lines as they are, the BOM is already stripped by the SourceFile."""
+
+
+class SharedSourceFileChecker(FileChecker):
+    """flake8 file checker running all plugins over the shared SourceFile of the file."""
+
+    def __init__(self, *, source, **kwargs):
+        self._source = source
+        super().__init__(**kwargs)
+
+    def _make_processor(self):
+        try:
+            return SharedSourceFileProcessor(self.filename, self.options, source=self._source)
+        except OSError as e:
+            self.report('E902', 0, 0, f'{type(e).__name__}: {e}')
+            return None
+
+
+@lru_cache(maxsize=None)
+def get_flake8_engine():
+    """Return the flake8 engine of the current process, creating it on the first call."""
+    logger.info('Initialize in-process flake8 engine')
+
+    return Flake8Engine()
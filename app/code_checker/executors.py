@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import math
+import signal
+import sys
+from collections import deque
+from functools import partial
+
+from django.conf import settings
+
+from code_checker.daemons import get_check_daemon_pool
+from code_checker.isolation import IsolatedRunError, set_process_limits, wait_isolated
+from code_checker.utils import (
+    CHECK_TIMEOUT_RETURN_CODE,
+    get_failed_results,
+    run_flake8_batch,
+    start_flake8_process,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the output of a subprocess at once
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+
+class SequentialCheckExecutor:
+    """Checks all files in one child process, one after another."""
+
+    def check_files(self, file_paths, sources=None):
+        """
+        Check files with flake8.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: A dict with the file path as a key and its SourceFile as a value, shared with the child process.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        return run_flake8_batch(file_paths=file_paths, sources=sources)
+
+
+class ProcessPoolCheckExecutor:
+    """
+    Checks files in a bounded pool of child processes running at the same time.
+
+    The files are split into one chunk per process. The children are forked from the worker with the already
+    loaded checker backend and have the same limits as the sequential check. Results are collected as the children
+    finish; the files of a failed chunk are checked again one by one, so only the file that breaks the limits fails.
+
+    The pool is built on forked children instead of `concurrent.futures.ProcessPoolExecutor`, because
+    the prefork Celery worker processes are daemonic and multiprocessing doesn't allow them to have children.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def check_files(self, file_paths, sources=None):
+        """
+        Check files with flake8 in parallel.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: A dict with the file path as a key and its SourceFile as a value, shared with the child processes.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        file_paths = [str(file_path) for file_path in file_paths]
+
+        if not file_paths:
+            return {}
+
+        chunk_size = math.ceil(len(file_paths) / self.max_workers)
+        pending_chunks = deque(file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size))
+        running = {}
+        results = {}
+
+        try:
+            while pending_chunks or running:
+                while pending_chunks and len(running) < self.max_workers:
+                    chunk = pending_chunks.popleft()
+                    running[start_flake8_process(file_paths=chunk, sources=sources)] = chunk
+
+                for process in wait_isolated(processes=list(running)):
+                    chunk = running.pop(process)
+                    process.close()
+                    results.update(self._collect_results(process=process, chunk=chunk, pending_chunks=pending_chunks))
+        finally:
+            for process in running:
+                process.close()
+
+        return results
+
+    @staticmethod
+    def _collect_results(process, chunk, pending_chunks):
+        """
+        Get the results of a finished process, queueing the files of a failed chunk for the one by one check.
+
+        Args:
+            process: The finished and closed IsolatedProcess.
+            chunk: Paths to the files checked by the process.
+            pending_chunks: The queue of chunks waiting for a free process.
+
+        Returns:
+            A dict with the results of the files, empty if the files are queued again.
+        """
+        try:
+            return process.result()
+        except IsolatedRunError as e:
+            if len(chunk) > 1:
+                logger.warning(f'Check of {len(chunk)} files failed ({e}), check the files one by one')
+                pending_chunks.extend([file_path] for file_path in chunk)
+                return {}
+
+            return get_failed_results(file_paths=chunk, error=e)
+
+
+class SubprocessCheckExecutor:
+    """
+    Checks every file with the flake8 command line in its own subprocess, running a bounded number at once.
+
+    For deployments that keep flake8 out of the worker process. The subprocesses are awaited with asyncio
+    in the thread of the task, `check_files` is a sync facade over the event loop.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def check_files(self, file_paths, sources=None):
+        """
+        Check files with flake8 subprocesses, every subprocess reads its file again.
+
+        Args:
+            file_paths: Paths to the files for checking.
+            sources: Not used, the subprocesses don't share the memory of the worker.
+
+        Returns:
+            A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        """
+        return asyncio.run(self._check_files(file_paths=[str(file_path) for file_path in file_paths]))
+
+    async def _check_files(self, file_paths):
+        """Check the files, at most `max_workers` subprocesses run at the same time."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        results = await asyncio.gather(
+            *(self._check_file(file_path=file_path, semaphore=semaphore) for file_path in file_paths),
+        )
+
+        return dict(zip(file_paths, results))
+
+    async def _check_file(self, file_path, semaphore):
+        """
+        Check one file in a flake8 subprocess limited by the code checker settings.
+
+        Args:
+            file_path: Path to the file for checking.
+            semaphore: The semaphore bounding the number of running subprocesses.
+
+        Returns:
+            A tuple with the return code, stdout and stderr.
+        """
+        timeout = settings.CODE_CHECKER_TIMEOUT
+        max_output_size = settings.CODE_CHECKER_MAX_OUTPUT_SIZE
+
+        async with semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, '-m', 'flake8', file_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    preexec_fn=partial(
+                        set_process_limits,
+                        timeout=timeout,
+                        memory_limit=settings.CODE_CHECKER_MEMORY_LIMIT,
+                    ),
+                )
+            except OSError as e:
+                return 1, '', str(e)
+
+            try:
+                stdout_, stderr_, return_code = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_output(stream=process.stdout, max_output_size=max_output_size, file_path=file_path),
+                        _read_output(stream=process.stderr, max_output_size=max_output_size, file_path=file_path),
+                        process.wait(),
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return CHECK_TIMEOUT_RETURN_CODE, '', f'Wall-clock limit of {timeout} seconds is exceeded'
+
+        if return_code == -signal.SIGXCPU:
+            return CHECK_TIMEOUT_RETURN_CODE, '', f'CPU time limit of {timeout} seconds is exceeded'
+
+        if return_code < 0 and not stderr_:
+            stderr_ = f'Check process is killed by signal {-return_code}'
+
+        return return_code, stdout_, stderr_
+
+
+CHECK_EXECUTORS = {
+    'sequential': lambda: SequentialCheckExecutor(),
+    'process_pool': lambda: ProcessPoolCheckExecutor(
+        max_workers=settings.CODE_CHECKER_EXECUTOR_WORKERS,
+    ),
+    'subprocess': lambda: SubprocessCheckExecutor(
+        max_workers=settings.CODE_CHECKER_EXECUTOR_WORKERS,
+    ),
+    # The daemons live as long as the worker process, so the pool is shared by all tasks of the process
+    'daemon_pool': lambda: get_check_daemon_pool(
+        size=settings.CODE_CHECKER_EXECUTOR_WORKERS,
+        max_files=settings.CODE_CHECKER_DAEMON_MAX_FILES,
+    ),
+}
+
+
+def get_check_executor():
+    """
+    Create the check executor selected by the CODE_CHECKER_EXECUTOR setting.
+
+    Returns:
+        An executor with the `check_files` method.
+    """
+    return CHECK_EXECUTORS[settings.CODE_CHECKER_EXECUTOR]()
+
+
+async def _read_output(stream, max_output_size, file_path):
+    """
+    Read the output of a subprocess in chunks as it is written, keeping whole lines within the size limit.
+
+    The output is read in chunks rather than lines, so a line longer than the buffer of the stream can't break
+    the read. Chunks past the limit are read and dropped.
+
+    Args:
+        stream: The stdout or stderr stream of the subprocess.
+        max_output_size: Maximum size of the kept output in characters.
+        file_path: Path to the checked file, for logging.
+
+    Returns:
+        The kept output.
+    """
+    chunks = []
+    output_size = 0
+
+    while chunk := await stream.read(OUTPUT_CHUNK_SIZE):
+        # A character takes at least one byte, so the bytes over the limit are never needed
+        if output_size <= max_output_size:
+            chunks.append(chunk)
+            output_size += len(chunk)
+
+    output = b''.join(chunks).decode(errors='replace')
+
+    if len(output) > max_output_size:
+        logger.warning(f'Output of the check of {file_path} is cut to {max_output_size} characters')
+        output = output[:output.rfind('\n', 0, max_output_size) + 1]
+
+    return output
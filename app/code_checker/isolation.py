@@ -0,0 +1,247 @@
+import logging
+import math
+import os
+import pickle  # nosec B403
+import resource
+import select
+import signal
+import time
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class IsolatedRunError(Exception):
+    """The function failed, was killed or returned too much data in the child process."""
+
+
+class IsolatedRunTimeoutError(IsolatedRunError):
+    """The function didn't finish in the wall-clock or CPU time limit."""
+
+
+def run_isolated(func, timeout, memory_limit, max_result_size, **kwargs):
+    """
+    Run a function in a forked child process with time and memory limits.
+
+    The child shares the already loaded state of the worker (flake8 plugins and options) through fork,
+    so the isolation costs one fork instead of a new interpreter.
+
+    Args:
+        func: The function to run, its result must be picklable.
+        timeout: Wall-clock limit in seconds, also used as the CPU time limit of the child.
+        memory_limit: Bytes of address space the child may allocate on top of the worker, 0 for no limit.
+        max_result_size: Maximum size of the pickled result in bytes.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The result of the function.
+
+    Raises:
+        IsolatedRunTimeoutError: If the child ran out of time.
+        IsolatedRunError: If the function raised, the child died or the result is too large.
+    """
+    process = IsolatedProcess(
+        func,
+        timeout=timeout,
+        memory_limit=memory_limit,
+        max_result_size=max_result_size,
+        **kwargs,
+    )
+
+    try:
+        while not process.is_finished:
+            wait_isolated(processes=[process])
+    finally:
+        process.close()
+
+    return process.result()
+
+
+def wait_isolated(processes):
+    """
+    Wait until some of the running child processes send their output, finish or run out of time.
+
+    Args:
+        processes: A list of running IsolatedProcess objects.
+
+    Returns:
+        A list of the processes that are finished, it may be empty when the processes only sent a part of the output.
+    """
+    time_left = min(process.time_left for process in processes)
+    ready, _, _ = select.select(processes, [], [], max(time_left, 0))
+
+    for process in ready:
+        process.read()
+
+    for process in processes:
+        process.check_deadline()
+
+    return [process for process in processes if process.is_finished]
+
+
+class IsolatedProcess:
+    """
+    A function running in a forked child process with time and memory limits.
+
+    The process is started by the constructor; `wait_isolated` reads its output until it is finished,
+    then `close` reaps the child and `result` returns the result of the function.
+    """
+
+    def __init__(self, func, timeout, memory_limit, max_result_size, **kwargs):
+        self.timeout = timeout
+        self.is_finished = False
+        self._max_result_size = max_result_size
+        self._deadline = time.monotonic() + timeout
+        self._chunks = []
+        self._result_size = 0
+        self._error = None
+        self._status = None
+
+        read_fd, write_fd = os.pipe()
+        self.pid = os.fork()
+
+        if self.pid == 0:
+            os.close(read_fd)
+            _run_child(write_fd=write_fd, func=func, timeout=timeout, memory_limit=memory_limit, kwargs=kwargs)
+
+        os.close(write_fd)
+        self._read_fd = read_fd
+
+    @property
+    def time_left(self):
+        """Seconds left until the wall-clock limit of the process."""
+        return self._deadline - time.monotonic()
+
+    def fileno(self):
+        """Return the read end of the pipe from the child, so the process can be passed to `select`."""
+        return self._read_fd
+
+    def read(self):
+        """Read the next chunk of the pickled result, killing the child when the result is too large."""
+        chunk = os.read(self._read_fd, READ_CHUNK_SIZE)
+
+        if not chunk:
+            self.is_finished = True
+            return
+
+        self._result_size += len(chunk)
+
+        if self._result_size > self._max_result_size:
+            self._kill(error=IsolatedRunError(f'Check result is larger than {self._max_result_size} bytes'))
+            return
+
+        self._chunks.append(chunk)
+
+    def check_deadline(self):
+        """Kill the child if it didn't finish in the wall-clock limit."""
+        if not self.is_finished and self.time_left <= 0:
+            self._kill(error=IsolatedRunTimeoutError(f'Wall-clock limit of {self.timeout} seconds is exceeded'))
+
+    def close(self):
+        """Close the pipe and reap the child, killing it if it is still running."""
+        if self._status is not None:
+            return
+
+        if not self.is_finished:
+            self._kill(error=IsolatedRunError('Check process is stopped'))
+
+        os.close(self._read_fd)
+        _, self._status = os.waitpid(self.pid, 0)
+
+    def result(self):
+        """
+        Get the result of the function from the closed process.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            IsolatedRunTimeoutError: If the child ran out of time.
+            IsolatedRunError: If the function raised, the child died or the result is too large.
+        """
+        if self._error:
+            raise self._error
+
+        if os.WIFSIGNALED(self._status) and os.WTERMSIG(self._status) == signal.SIGXCPU:
+            raise IsolatedRunTimeoutError(f'CPU time limit of {self.timeout} seconds is exceeded')
+
+        payload = b''.join(self._chunks)
+
+        if not payload:
+            raise IsolatedRunError(f'Check process died with status {self._status}')
+
+        is_success, result = pickle.loads(payload)  # nosec B301, the payload is written by our own child process
+
+        if not is_success:
+            raise IsolatedRunError(result)
+
+        return result
+
+    def _kill(self, error):
+        """
+        Kill the child and remember the error for the result.
+
+        Args:
+            error: The IsolatedRunError raised by `result`.
+        """
+        os.kill(self.pid, signal.SIGKILL)
+        self._error = error
+        self.is_finished = True
+
+
+def get_address_space_size():
+    """
+    Get the current virtual memory size of the process.
+
+    Returns:
+        Size of the address space in bytes.
+    """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[0]) * resource.getpagesize()
+
+
+def _run_child(write_fd, func, timeout, memory_limit, kwargs):
+    """
+    Set the limits, run the function and send the pickled result to the parent, never returns.
+
+    Args:
+        write_fd: Write end of the pipe to the parent.
+        func: The function to run.
+        timeout: CPU time limit in seconds.
+        memory_limit: Bytes of address space the child may allocate on top of the worker, 0 for no limit.
+        kwargs: Keyword arguments for the function.
+    """
+    exit_code = 1
+
+    try:
+        set_process_limits(timeout=timeout, memory_limit=memory_limit)
+
+        try:
+            payload = pickle.dumps((True, func(**kwargs)))
+        except Exception as e:
+            payload = pickle.dumps((False, f'{type(e).__name__}: {e}'))
+
+        with os.fdopen(write_fd, 'wb') as pipe:
+            pipe.write(payload)
+
+        exit_code = 0
+    finally:
+        # The child must never return into the code of the worker
+        os._exit(exit_code)
+
+
+def set_process_limits(timeout, memory_limit):
+    """
+    Limit CPU time and address space of the current process.
+
+    Args:
+        timeout: CPU time limit in seconds.
+        memory_limit: Bytes of address space the process may allocate on top of the current size, 0 for no limit.
+    """
+    cpu_limit = math.ceil(timeout)
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+
+    if memory_limit:
+        address_space = get_address_space_size() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
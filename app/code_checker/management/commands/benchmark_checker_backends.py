@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from code_checker.backends import CHECK_BACKENDS, CheckBackendUnavailableError, get_check_backend
+
+
+class Command(BaseCommand):
+    help = 'Check the same corpus of python files with every checker backend and compare their speed.'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', help='Directory with the python files to check.')
+        parser.add_argument(
+            '--backends',
+            nargs='+',
+            choices=list(CHECK_BACKENDS),
+            default=list(CHECK_BACKENDS),
+            help='Backends to compare, all by default.',
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Number of runs, the fastest one is reported.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CODE_CHECKER_BATCH_SIZE,
+            help='Number of files checked in one call of the backend, as in one check task.',
+        )
+
+    def handle(self, *args, **options):
+        file_paths = sorted(str(file_path) for file_path in Path(options['corpus']).rglob('*.py'))
+
+        if not file_paths:
+            raise CommandError(f'No python files in {options["corpus"]}')
+
+        self.stdout.write(f'{len(file_paths)} files, the fastest of {options["repeat"]} runs')
+
+        for name in options['backends']:
+            try:
+                backend = get_check_backend(name)
+            except CheckBackendUnavailableError as e:
+                self.stdout.write(f'{name:<22} skipped: {e}')
+                continue
+
+            runs = [
+                self._run_backend(backend=backend, file_paths=file_paths, batch_size=options['batch_size'])
+                for _ in range(options['repeat'])
+            ]
+            duration, results = min(runs, key=lambda run: run[0])
+            problems_count = sum(stdout_.count('\n') for _, stdout_, _ in results.values())
+            failed_count = sum(bool(stderr_) for _, _, stderr_ in results.values())
+
+            self.stdout.write(
+                f'{name:<22} {duration:8.2f} s {len(file_paths) / duration:10.1f} files/s '
+                f'{problems_count:8} problems {failed_count:5} failed files',
+            )
+
+    @staticmethod
+    def _run_backend(backend, file_paths, batch_size):
+        """
+        Check all files with the backend in batches.
+
+        Args:
+            backend: The checker backend.
+            file_paths: Paths to the files for checking.
+            batch_size: Number of files checked in one call of the backend.
+
+        Returns:
+            A tuple with the duration of the run in seconds and the results of all files.
+        """
+        results = {}
+        started_at = time.perf_counter()
+
+        for i in range(0, len(file_paths), batch_size):
+            results.update(backend.check_files(file_paths=file_paths[i:i + batch_size]))
+
+        return time.perf_counter() - started_at, results
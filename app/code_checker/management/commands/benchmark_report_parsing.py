@@ -0,0 +1,86 @@
+import re
+import time
+import tracemalloc
+from collections import namedtuple
+
+from django.core.management.base import BaseCommand
+
+from reports.reports_services import LazyResultReport
+
+
+class Command(BaseCommand):
+    help = 'Parse the same flake8 output into report rows with a class per row and with the shared one.'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=10000, help='Number of lines in the flake8 output.')
+        parser.add_argument('--repeat', type=int, default=3, help='Number of runs, the fastest one is reported.')
+
+    def handle(self, *args, **options):
+        output = ''.join(
+            f'file.py:{line_number}:80: E501 line too long (100 > 79 characters)\n'
+            for line_number in range(1, options['lines'] + 1)
+        )
+        parsers = {
+            'class per row': self._parse_with_class_per_row,
+            'shared row type': lambda row_result: list(LazyResultReport(row_result=row_result)),
+        }
+
+        self.stdout.write(f'{options["lines"]} lines, the fastest of {options["repeat"]} runs')
+        parsed_rows = []
+
+        for name, parser in parsers.items():
+            durations = []
+
+            for _ in range(options['repeat']):
+                started_at = time.perf_counter()
+                parser(output)
+                durations.append(time.perf_counter() - started_at)
+
+            # The memory is measured in a separate run, tracing slows down the allocations
+            tracemalloc.start()
+            rows = parser(output)
+            retained_size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            parsed_rows.append([tuple(row) for row in rows])
+            self.stdout.write(
+                f'{name:<16} {min(durations) * 1000:10.1f} ms {retained_size / 1024 / 1024:8.1f} MiB retained '
+                f'{len(rows):8} rows',
+            )
+
+        if parsed_rows[0] != parsed_rows[1]:
+            self.stdout.write(self.style.WARNING('The parsers returned different rows'))
+
+    @staticmethod
+    def _parse_with_class_per_row(row_result):
+        """
+        Parse the output the way the report page did before the shared FileReport type.
+
+        Every row gets its own namedtuple class, the regexes are compiled on every call
+        and every line is matched three times.
+
+        Args:
+            row_result: The flake8 output.
+
+        Returns:
+            A list of the rows.
+        """
+        location_regex = re.compile(r'^([^:]+:\d+:\d+):')
+        error_code_regex = re.compile(r'^.*:\d+:\d+:\s*([A-Z]\d+)\s')
+        error_text_regex = re.compile(r'^.*:\d+:\d+:\s*[A-Z]\d+\s(.+)')
+        rows = []
+
+        for line in row_result.strip().split('\n'):
+            location_match = location_regex.match(line)
+            error_code_match = error_code_regex.match(line)
+            error_text_match = error_text_regex.match(line)
+
+            rows.append(
+                namedtuple('FileReport', 'location, error_code, error_text')(
+                    location_match.group(1) if location_match else '',
+                    error_code_match.group(1) if error_code_match else '',
+                    error_text_match.group(1) if error_text_match else '',
+                ),
+            )
+
+        return rows
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0004_alter_checklog_log_text_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codecheck',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Claimed for checking at'),
+        ),
+    ]
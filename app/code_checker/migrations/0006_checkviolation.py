@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0005_codecheck_claimed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckViolation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=80, verbose_name='Filename')),
+                ('line', models.PositiveIntegerField(verbose_name='Line')),
+                ('column', models.PositiveIntegerField(verbose_name='Column')),
+                ('error_code', models.CharField(max_length=16, verbose_name='Error code')),
+                ('error_text', models.TextField(max_length=8000, verbose_name='Error text')),
+                ('code_check', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='code_checker.codecheck', verbose_name='Code Check')),
+            ],
+            options={
+                'verbose_name': 'Check Violation',
+                'verbose_name_plural': 'Check Violations',
+                'indexes': [models.Index(fields=['code_check', 'error_code'], name='checkviolation_check_code_idx'), models.Index(fields=['error_code'], name='checkviolation_code_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0006_checkviolation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='checklog',
+            index=models.Index(fields=['code_check', '-created_at'], name='checklog_check_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='codecheck',
+            index=models.Index(fields=['file', 'status'], name='codecheck_file_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='codecheck',
+            index=models.Index(condition=models.Q(('status__in', ['Unchecked', 'In checking'])), fields=['claimed_at'], name='codecheck_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:03
+
+from django.db import migrations
+
+# Rows were written with both enum names (the old field default) and enum values.
+STATUS_CODES = {
+    1: ('UNCHECKED', 'Unchecked'),
+    2: ('IN_CHECKING', 'In checking'),
+    3: ('DONE', 'Done'),
+}
+
+
+def status_strings_to_codes(apps, schema_editor):
+    """Replace status names and values with integer codes while the column is still a string."""
+    CodeCheck = apps.get_model('code_checker', 'CodeCheck')
+
+    for code, status_strings in STATUS_CODES.items():
+        CodeCheck.objects.filter(status__in=status_strings).update(status=str(code))
+
+    CodeCheck.objects.exclude(status__in=[str(code) for code in STATUS_CODES]).update(status='1')
+
+
+def status_codes_to_strings(apps, schema_editor):
+    """Replace integer codes with status values after the column is a string again."""
+    CodeCheck = apps.get_model('code_checker', 'CodeCheck')
+
+    for code, status_strings in STATUS_CODES.items():
+        CodeCheck.objects.filter(status=str(code)).update(status=status_strings[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0007_checker_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(status_strings_to_codes, reverse_code=status_codes_to_strings),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0008_codecheck_status_codes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='codecheck',
+            name='codecheck_pending_idx',
+        ),
+        migrations.AlterField(
+            model_name='codecheck',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Unchecked'), (2, 'In checking'), (3, 'Done')], default=1, verbose_name='Check status'),
+        ),
+        migrations.AddIndex(
+            model_name='codecheck',
+            index=models.Index(condition=models.Q(('status__in', [1, 2])), fields=['claimed_at'], name='codecheck_pending_idx'),
+        ),
+    ]
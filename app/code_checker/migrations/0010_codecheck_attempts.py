@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_checker', '0009_codecheck_integer_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codecheck',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Failed check attempts'),
+        ),
+        migrations.AddField(
+            model_name='codecheck',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Next check attempt at'),
+        ),
+        migrations.AlterField(
+            model_name='codecheck',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Unchecked'), (2, 'In checking'), (3, 'Done'), (4, 'Quarantined')], default=1, verbose_name='Check status'),
+        ),
+    ]
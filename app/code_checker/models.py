@@ -1,21 +1,22 @@
-from enum import Enum
-
 from django.db import models
 
 from code_files.models import UploadedFile
 
 
-class CodeCheckStatus(Enum):
+class CodeCheckStatus(models.IntegerChoices):
     """Enum order statuses."""
 
-    DONE = 'Done'
-    IN_CHECKING = 'In checking'
-    UNCHECKED = 'Unchecked'
+    UNCHECKED = 1, 'Unchecked'
+    IN_CHECKING = 2, 'In checking'
+    DONE = 3, 'Done'
+    QUARANTINED = 4, 'Quarantined'
 
 
 class CodeCheck(models.Model):
     """Code Check model."""
 
+    WITHOUT_PROBLEMS = 'Without problems'
+
     file = models.ForeignKey(
         verbose_name='Uploaded File',
         to=UploadedFile,
@@ -25,25 +26,46 @@ class CodeCheck(models.Model):
         verbose_name='Timestamp',
         auto_now_add=True,
     )
-    status = models.CharField(
+    status = models.PositiveSmallIntegerField(
         verbose_name='Check status',
-        max_length=11,
-        choices=[(status.name, status.value) for status in CodeCheckStatus],
-        default=CodeCheckStatus.UNCHECKED.name,
+        choices=CodeCheckStatus.choices,
+        default=CodeCheckStatus.UNCHECKED,
     )
     last_check_result = models.TextField(
         verbose_name='Last check result',
         max_length=8000,
-        default='Without problems',
+        default=WITHOUT_PROBLEMS,
     )
     is_notified = models.BooleanField(
         verbose_name='User is notified by email',
         default=False,
     )
+    claimed_at = models.DateTimeField(
+        verbose_name='Claimed for checking at',
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Failed check attempts',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Next check attempt at',
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         verbose_name = 'Code Check'
         verbose_name_plural = 'Code Checks'
+        indexes = [
+            models.Index(fields=['file', 'status'], name='codecheck_file_status_idx'),
+            models.Index(
+                fields=['claimed_at'],
+                condition=models.Q(status__in=[CodeCheckStatus.UNCHECKED.value, CodeCheckStatus.IN_CHECKING.value]),
+                name='codecheck_pending_idx',
+            ),
+        ]
 
 
 class CheckLog(models.Model):
@@ -66,3 +88,46 @@ class CheckLog(models.Model):
     class Meta:
         verbose_name = 'Check Log'
         verbose_name_plural = 'Check Logs'
+        indexes = [
+            models.Index(fields=['code_check', '-created_at'], name='checklog_check_created_idx'),
+        ]
+
+
+class CheckViolation(models.Model):
+    """Check violation model, one row per problem found by flake8."""
+
+    code_check = models.ForeignKey(
+        verbose_name='Code Check',
+        to=CodeCheck,
+        on_delete=models.CASCADE,
+    )
+    filename = models.CharField(
+        verbose_name='Filename',
+        max_length=80,
+    )
+    line = models.PositiveIntegerField(
+        verbose_name='Line',
+    )
+    column = models.PositiveIntegerField(
+        verbose_name='Column',
+    )
+    error_code = models.CharField(
+        verbose_name='Error code',
+        max_length=16,
+    )
+    error_text = models.TextField(
+        verbose_name='Error text',
+        max_length=8000,
+    )
+
+    class Meta:
+        verbose_name = 'Check Violation'
+        verbose_name_plural = 'Check Violations'
+        indexes = [
+            models.Index(fields=['code_check', 'error_code'], name='checkviolation_check_code_idx'),
+            models.Index(fields=['error_code'], name='checkviolation_code_idx'),
+        ]
+
+    @property
+    def location(self):
+        return f'{self.filename}:{self.line}:{self.column}'
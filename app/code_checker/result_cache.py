@@ -0,0 +1,101 @@
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+
+from code_checker.backends import get_check_backend
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'flake8_result'
+CACHE_HITS_KEY = f'{CACHE_KEY_PREFIX}:hits'
+CACHE_MISSES_KEY = f'{CACHE_KEY_PREFIX}:misses'
+
+# flake8 output starts every line with the checked path, which differs between users for the same content.
+FILE_PATH_MARKER = '\0'
+
+
+def get_cached_results(content_hashes):
+    """
+    Get saved flake8 results for files with the same name, content and toolchain.
+
+    Args:
+        content_hashes: A dict with the file path as a key and SHA-256 of its content as a value.
+
+    Returns:
+        A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+    """
+    keys = {
+        file_path: _generate_cache_key(file_path=file_path, content_hash=content_hash)
+        for file_path, content_hash in content_hashes.items()
+    }
+    cached = cache.get_many(keys.values())
+
+    results = {}
+
+    for file_path, key in keys.items():
+        if key in cached:
+            return_code, stdout_, stderr_ = cached[key]
+            results[file_path] = (return_code, stdout_.replace(FILE_PATH_MARKER, file_path), stderr_)
+
+    _record_cache_usage(hits=len(results), misses=len(keys) - len(results))
+
+    return results
+
+
+def cache_results(results, content_hashes):
+    """
+    Save flake8 results by the name and the content hash of the checked files.
+
+    Failed runs (with stderr) are not saved, so they are checked again next time.
+
+    Args:
+        results: A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+        content_hashes: A dict with the file path as a key and SHA-256 of its content as a value.
+    """
+    to_cache = {
+        _generate_cache_key(file_path=file_path, content_hash=content_hashes[file_path]): (
+            return_code,
+            stdout_.replace(file_path, FILE_PATH_MARKER),
+            '',
+        )
+        for file_path, (return_code, stdout_, stderr_) in results.items()
+        if not stderr_ and content_hashes.get(file_path)
+    }
+
+    if to_cache:
+        cache.set_many(to_cache, timeout=settings.CODE_CHECKER_CACHE_TIMEOUT)
+
+
+def _generate_cache_key(file_path, content_hash):
+    """
+    Generate the cache key for the file name and content and the current flake8 toolchain.
+
+    The result depends on the file name too: flake8-builtins reports a module named as a builtin one,
+    and per-file-ignores are matched by the name.
+
+    Args:
+        file_path: Path to the file, only its name is a part of the key.
+        content_hash: SHA-256 of the file content.
+
+    Returns:
+        The cache key.
+    """
+    return f'{CACHE_KEY_PREFIX}:{get_check_backend().fingerprint}:{os.path.basename(file_path)}:{content_hash}'
+
+
+def _record_cache_usage(hits, misses):
+    """
+    Increase hits and misses counters of the result cache.
+
+    Args:
+        hits: Number of files found in the cache.
+        misses: Number of files not found in the cache.
+    """
+    logger.info(f'flake8 result cache: {hits=}, {misses=}')
+
+    for key, count in ((CACHE_HITS_KEY, hits), (CACHE_MISSES_KEY, misses)):
+        if count:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, count)
@@ -0,0 +1,89 @@
+import ast
+import hashlib
+import io
+import mmap
+import os
+import tokenize
+from functools import cached_property
+
+# Files of this size and larger are memory-mapped instead of read into memory, in bytes
+MMAP_MIN_SIZE = 1024 * 1024
+
+
+class SourceFile:
+    """
+    An uploaded file read once, its lines, tokens and AST are computed on the first use and shared by all check stages.
+
+    The lines are decoded the same way flake8 reads a file, so flake8 checks get the same result as from the file
+    itself. The worker only reads the content for its hash, the lines, tokens and AST are computed in the limited
+    check process that inherits the content.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = str(file_path)
+
+    @cached_property
+    def content(self):
+        """
+        Bytes of the file, large files are memory-mapped.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        with open(self.file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < MMAP_MIN_SIZE:
+                return file.read()
+
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @cached_property
+    def content_hash(self):
+        """Hex digest of SHA-256 of the file content or None if the file can't be read."""
+        try:
+            return hashlib.sha256(self.content).hexdigest()
+        except OSError:
+            return None
+
+    @cached_property
+    def lines(self):
+        """
+        Lines of the file decoded by its encoding declaration, or as latin-1 if it can't be decoded, without the BOM.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(self.content).readline)
+            lines = io.TextIOWrapper(io.BytesIO(self.content), encoding, line_buffering=True).readlines()
+        except (SyntaxError, UnicodeError):
+            lines = io.TextIOWrapper(io.BytesIO(self.content), 'latin-1').readlines()
+
+        if lines and lines[0][:1] == '\uFEFF':
+            lines[0] = lines[0][1:]
+        elif lines and lines[0][:3] == '\xEF\xBB\xBF':
+            lines[0] = lines[0][3:]
+
+        return tuple(lines)
+
+    @cached_property
+    def tokens(self):
+        """
+        Tokens of the file.
+
+        Raises:
+            SyntaxError: If the file can't be tokenized.
+            tokenize.TokenError: If the file ends in the middle of a statement.
+        """
+        line_iter = iter(self.lines)
+
+        return tuple(tokenize.generate_tokens(lambda: next(line_iter)))
+
+    @cached_property
+    def tree(self):
+        """
+        Abstract syntax tree of the file.
+
+        Raises:
+            SyntaxError: If the file can't be parsed.
+        """
+        return ast.parse(''.join(self.lines))
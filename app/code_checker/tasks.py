@@ -1,31 +1,193 @@
 import logging
+import time
+from datetime import timedelta
+from itertools import islice
 
+from celery import chord
+from celery.signals import worker_init, worker_process_init
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from redis.exceptions import LockError
+
+from code_checker.backends import CheckBackendUnavailableError, get_check_backend
 from code_checker.code_checker_services import (
     check_user_files,
-    get_users_files_with_new_or_overwritten_state,
+    generate_notification,
+    get_files_with_new_or_overwritten_state,
+    group_files_by_user,
 )
+from code_checker.dirty_files import mark_files_dirty, pop_due_dirty_files
+from code_files.models import UploadedFile
 from config.celery import app
 from email_sender.tasks import send_notification_email
 
 logger = logging.getLogger(__name__)
 
+RUN_FLAKE8_CHECKER_LOCK_KEY = 'code_checker:run_flake8_checker_lock'
+
+
+@worker_init.connect
+def check_backend_available(**kwargs):
+    """
+    Stop the worker on start if the checker backend set by CODE_CHECKER_BACKEND can't run on this host.
+
+    Celery only logs exceptions of signal handlers, SystemExit is the one that stops the worker.
+    """
+    try:
+        get_check_backend()
+    except CheckBackendUnavailableError as e:
+        raise SystemExit(f'Checker backend {settings.CODE_CHECKER_BACKEND!r} is unavailable: {e}') from e
+
+
+@worker_process_init.connect
+def init_check_backend(**kwargs):
+    """Load the checker backend once per worker process instead of once per checked file."""
+    get_check_backend()
+
 
 @app.task(name='Run flake8 checker')
 def run_flake8_checker():
-    """Task for check upload files use flake8."""
-    uploaded_user_files = get_users_files_with_new_or_overwritten_state()
-
-    for user in uploaded_user_files:
-        logger.info(f'Work with user: {user}')
-        user_uploaded_files = user.filtered_files
-
-        if not user_uploaded_files:
-            logger.info(f'No uploaded files for user: {user}')
-        else:
-            result = check_user_files(uploaded_files=user_uploaded_files)
-
-            send_notification_email.delay(
-                user_email=user.email,
-                message=result.message,
-                code_check_objects_id=result.code_check_objects_id,
-            )
+    """
+    Task for dispatch checks of uploaded files to the workers.
+
+    Only one run dispatches at a time, a run started while the previous one holds the lock does nothing.
+    """
+    lock = cache.lock(RUN_FLAKE8_CHECKER_LOCK_KEY, timeout=settings.CODE_CHECKER_RUN_LOCK_TIMEOUT)
+
+    if not lock.acquire(blocking=False):
+        logger.info('Previous run of the flake8 checker is still dispatching files, skip this run')
+        return
+
+    try:
+        _dispatch_dirty_files(lock=lock)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning('Lock of the flake8 checker expired before the run finished')
+
+
+def _dispatch_dirty_files(lock):
+    """
+    Dispatch checks of files from the dirty files set, so a run without new uploads costs one Redis command.
+
+    Files marked less than CODE_CHECKER_SWEEP_DELAY seconds ago are left to the check started on upload.
+    Files are taken in chunks, at most CODE_CHECKER_MAX_FILES_PER_RUN files and for at most
+    CODE_CHECKER_RUN_TIME_BUDGET seconds per run, the rest stay for the next run.
+
+    Args:
+        lock: The acquired lock of the run, it's extended after every dispatched user.
+    """
+    due_before = timezone.now() - timedelta(seconds=settings.CODE_CHECKER_SWEEP_DELAY)
+    deadline = time.monotonic() + settings.CODE_CHECKER_RUN_TIME_BUDGET
+    files_left = settings.CODE_CHECKER_MAX_FILES_PER_RUN
+    keep_running = True
+
+    while keep_running and files_left > 0:
+        if not _keep_running(lock=lock, deadline=deadline):
+            break
+
+        file_ids = pop_due_dirty_files(
+            count=min(settings.CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE, files_left),
+            due_before=due_before,
+        )
+
+        if not file_ids:
+            break
+
+        files_left -= len(file_ids)
+        dispatched_file_ids = set()
+
+        try:
+            for user_email, user_file_ids in group_files_by_user(file_ids=file_ids):
+                logger.info(f'Work with user: {user_email}')
+                dispatch_user_checks(user_email=user_email, file_ids=user_file_ids)
+                dispatched_file_ids.update(user_file_ids)
+
+                if not (keep_running := _keep_running(lock=lock, deadline=deadline)):
+                    break
+        finally:
+            # The taken files are already out of the set, the ones not dispatched go back for the next run
+            undispatched_file_ids = [file_id for file_id in file_ids if file_id not in dispatched_file_ids]
+
+            if undispatched_file_ids:
+                mark_files_dirty(file_ids=undispatched_file_ids, marked_at=due_before)
+
+
+def _keep_running(lock, deadline):
+    """
+    Check the time budget of the run and extend its lock, so a long chunk can't outlive the lock.
+
+    Args:
+        lock: The acquired lock of the run.
+        deadline: The time.monotonic() value the run has to stop at.
+
+    Returns:
+        True if the run can dispatch more checks, False if the time budget is over or the lock is lost.
+    """
+    if time.monotonic() >= deadline:
+        logger.info('Time budget of the flake8 checker is over, the rest of the files are left for the next run')
+        return False
+
+    try:
+        lock.extend(settings.CODE_CHECKER_RUN_LOCK_TIMEOUT, replace_ttl=True)
+    except LockError:
+        logger.warning('Lock of the flake8 checker is lost, the rest of the files are left for the next run')
+        return False
+
+    return True
+
+
+@app.task(name='Reconcile dirty files')
+def reconcile_dirty_files():
+    """Task for mark dirty the files waiting for the check in the database, but missed in the dirty files set."""
+    chunk_size = settings.CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE
+    file_ids = get_files_with_new_or_overwritten_state().iterator(chunk_size=chunk_size)
+    marked_at = timezone.now() - timedelta(seconds=settings.CODE_CHECKER_SWEEP_DELAY)
+    reconciled_count = 0
+
+    while chunk := list(islice(file_ids, chunk_size)):
+        mark_files_dirty(file_ids=chunk, marked_at=marked_at)
+        reconciled_count += len(chunk)
+
+    logger.info(f'Reconciled {reconciled_count} files waiting for the check')
+
+
+def dispatch_user_checks(user_email, file_ids):
+    """
+    Split user files into batches, check every batch in a separate task and notify the user when all are done.
+
+    Args:
+        user_email: Email of the files owner.
+        file_ids: IDs of the uploaded files for checking.
+    """
+    batch_size = settings.CODE_CHECKER_BATCH_SIZE
+    batches = [file_ids[start:start + batch_size] for start in range(0, len(file_ids), batch_size)]
+
+    logger.info(f'Dispatch {len(batches)} check batches for user: {user_email}')
+
+    chord(check_files_batch.s(file_ids=batch) for batch in batches)(
+        notify_user_about_checks.s(user_email=user_email),
+    )
+
+
+@app.task(name='Check files batch')
+def check_files_batch(file_ids):
+    """Task for check a batch of uploaded files use flake8."""
+    return check_user_files(uploaded_files=UploadedFile.objects.filter(pk__in=file_ids))
+
+
+@app.task(name='Notify user about checks')
+def notify_user_about_checks(check_results, user_email):
+    """Task for send one email about all checked batches of the user."""
+    notification = generate_notification(check_results=check_results)
+
+    if notification is None:
+        logger.info(f'No checked files for user: {user_email}')
+    else:
+        send_notification_email.delay(
+            user_email=user_email,
+            message=notification.message,
+            code_check_objects_id=notification.code_check_objects_id,
+        )
@@ -1,3 +1,13 @@
+from code_checker.tests.test_backends import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_commands import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_daemons import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_dirty_files import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_engine import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_executors import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_isolation import *  # noqa: F403, F401, F811.
 from code_checker.tests.test_models import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_result_cache import *  # noqa: F403, F401, F811.
 from code_checker.tests.test_services import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_sources import *  # noqa: F403, F401, F811.
+from code_checker.tests.test_tasks import *  # noqa: F403, F401, F811.
 from code_checker.tests.test_utils import *  # noqa: F403, F401, F811.
@@ -0,0 +1,52 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.admin.sites import site
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from code_checker.admin import CodeCheckAdmin
+from code_checker.models import CodeCheck, CodeCheckStatus
+from code_files.models import UploadedFile
+from users.models import User
+
+
+class CodeCheckAdminTest(TestCase):
+    """Test suite for the CodeCheck admin."""
+
+    def setUp(self) -> None:
+        """Set up a quarantined and a checked file."""
+        self.user = User.objects.create_user(email='mrrobot@example.com', password='testpassword')
+        self.files = [
+            UploadedFile.objects.create(user=self.user, file=SimpleUploadedFile(f'admin_{i}.py', b'x = 1\n'))
+            for i in range(2)
+        ]
+        self.quarantined_check = CodeCheck.objects.create(
+            file=self.files[0],
+            status=CodeCheckStatus.QUARANTINED.value,
+            attempts=5,
+        )
+        self.done_check = CodeCheck.objects.create(file=self.files[1], status=CodeCheckStatus.DONE.value)
+
+    def tearDown(self) -> None:
+        """Clean up after the tests."""
+        for file_obj in self.files:
+            file_obj.file.delete()
+
+        self.user.delete()
+
+    @patch('code_checker.admin.mark_files_dirty')
+    def test_retry_checks(self, mock_mark_files_dirty) -> None:
+        """Test only the quarantined checks of the selection are reset and their files marked dirty."""
+        model_admin = CodeCheckAdmin(model=CodeCheck, admin_site=site)
+
+        with patch.object(model_admin, 'message_user') as mock_message_user:
+            model_admin.retry_checks(request=Mock(), queryset=CodeCheck.objects.all())
+
+        self.quarantined_check.refresh_from_db()
+        self.done_check.refresh_from_db()
+
+        assert self.quarantined_check.status == CodeCheckStatus.UNCHECKED.value
+        assert self.quarantined_check.attempts == 0
+        assert self.done_check.status == CodeCheckStatus.DONE.value
+        mock_mark_files_dirty.assert_called_once_with(file_ids=[self.files[0].id])
+        assert '1 checks' in mock_message_user.call_args.args[1]
@@ -0,0 +1,106 @@
+import json
+import subprocess  # nosec B404
+from unittest.mock import Mock, patch
+
+import pytest
+from django.test import override_settings
+
+from code_checker.backends import (
+    CheckBackend,
+    CheckBackendUnavailableError,
+    PycodestylePyflakesBackend,
+    RuffBackend,
+    get_check_backend,
+)
+from code_checker.engine import Flake8Engine
+
+
+class TestCheckBackends:
+    """Test suite for the checker backends."""
+
+    @pytest.mark.parametrize(
+        'backend_name, backend_class',
+        [
+            ('flake8', Flake8Engine),
+            ('pycodestyle_pyflakes', PycodestylePyflakesBackend),
+        ],
+    )
+    def test_get_check_backend(self, backend_name, backend_class) -> None:
+        """Test the backend is selected by the CODE_CHECKER_BACKEND setting and created once."""
+        with override_settings(CODE_CHECKER_BACKEND=backend_name):
+            assert isinstance(get_check_backend(), backend_class)
+            assert isinstance(get_check_backend(), CheckBackend)
+            assert get_check_backend() is get_check_backend(backend_name)
+
+    def test_check_backend_requires_check_files(self) -> None:
+        """Test a backend without the check of the files can't be created."""
+
+        class VersionOnlyBackend(CheckBackend):
+            version = '1.0'
+
+        with pytest.raises(TypeError):
+            VersionOnlyBackend()
+
+    def test_flake8_subprocess_backend_returns_the_same_results_as_flake8(self, tmp_path) -> None:
+        """Test the flake8 command line gives the same result as flake8 in the worker."""
+        file_paths = []
+
+        for number in range(3):
+            file_path = tmp_path / f'file_{number}.py'
+            file_path.write_text("print ('Hello, world!')\n" if number % 2 else "print('Hello, world!')\n")
+            file_paths.append(str(file_path))
+
+        flake8_subprocess = get_check_backend('flake8_subprocess')
+
+        assert flake8_subprocess.check_files(file_paths) == get_check_backend('flake8').check_files(file_paths)
+        assert flake8_subprocess.fingerprint == get_check_backend('flake8').fingerprint
+
+    def test_pycodestyle_pyflakes_backend(self, tmp_path) -> None:
+        """Test pycodestyle and pyflakes errors are reported in the flake8 format."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text("import os\nprint ('Hello, world!')\n")
+        broken_file = tmp_path / 'broken_file.py'
+        broken_file.write_text('def f(:\n')
+
+        results = get_check_backend('pycodestyle_pyflakes').check_files([test_file, broken_file])
+
+        assert results[str(test_file)] == (
+            1,
+            f"{test_file}:1:1: F401 'os' imported but unused\n{test_file}:2:6: E211 whitespace before '('\n",
+            '',
+        )
+        assert results[str(broken_file)][1].startswith(f'{broken_file}:1:7: E999 SyntaxError:')
+
+    @patch('code_checker.backends.shutil.which', return_value=None)
+    def test_ruff_backend_is_unavailable_without_binary(self, mock_which) -> None:
+        """Test the ruff backend can't be created when ruff is not installed."""
+        with pytest.raises(CheckBackendUnavailableError):
+            RuffBackend()
+
+    @patch('code_checker.backends.subprocess.run')
+    @patch('code_checker.backends.shutil.which', return_value='/usr/bin/ruff')
+    def test_ruff_backend_normalizes_result(self, mock_which, mock_run, tmp_path) -> None:
+        """Test the JSON output of ruff is split by file into report lines in the flake8 format."""
+        first_file = str(tmp_path / 'first.py')
+        second_file = str(tmp_path / 'second.py')
+        mock_run.return_value = Mock(
+            spec=subprocess.CompletedProcess,
+            returncode=0,
+            stdout=json.dumps(
+                [
+                    {
+                        'filename': first_file,
+                        'location': {'row': 1, 'column': 8},
+                        'code': 'F401',
+                        'message': '`os` imported but unused',
+                    },
+                ],
+            ),
+        )
+
+        results = RuffBackend().check_files([first_file, second_file])
+
+        assert results == {
+            first_file: (1, f'{first_file}:1:8: F401 `os` imported but unused\n', ''),
+            second_file: (0, '', ''),
+        }
@@ -0,0 +1,50 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+class TestBenchmarkCheckerBackendsCommand:
+    """Test suite for the command comparing the checker backends."""
+
+    @patch('code_checker.backends.shutil.which', return_value=None)
+    def test_benchmark_checker_backends(self, mock_which, tmp_path) -> None:
+        """Test every backend checks the corpus and an unavailable backend is skipped."""
+        (tmp_path / 'file.py').write_text("import os\nprint ('Hello, world!')\n")
+        output = StringIO()
+
+        call_command(
+            'benchmark_checker_backends',
+            str(tmp_path),
+            '--backends',
+            'pycodestyle_pyflakes',
+            'ruff',
+            '--repeat',
+            '1',
+            stdout=output,
+        )
+
+        assert '1 files' in output.getvalue()
+        assert '2 problems' in output.getvalue()
+        assert 'ruff                   skipped: ruff executable is not found' in output.getvalue()
+
+    def test_benchmark_checker_backends_without_files(self, tmp_path) -> None:
+        """Test the command fails on a corpus without python files."""
+        with pytest.raises(CommandError):
+            call_command('benchmark_checker_backends', str(tmp_path))
+
+
+class TestBenchmarkReportParsingCommand:
+    """Test suite for the command comparing the report parsers."""
+
+    def test_benchmark_report_parsing(self) -> None:
+        """Test both parsers parse every line into the same rows."""
+        output = StringIO()
+
+        call_command('benchmark_report_parsing', '--lines', '50', '--repeat', '1', stdout=output)
+
+        assert 'class per row' in output.getvalue()
+        assert 'shared row type' in output.getvalue()
+        assert output.getvalue().count('50 rows') == 2
+        assert 'different rows' not in output.getvalue()
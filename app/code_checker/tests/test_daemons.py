@@ -0,0 +1,73 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from code_checker.daemons import CheckDaemonPool
+from code_checker.executors import SequentialCheckExecutor
+from code_checker.utils import CHECK_TIMEOUT_RETURN_CODE
+
+
+def _check_files_slowly(engine, file_paths, max_output_size):
+    time.sleep(10)
+
+
+def _crash(engine, file_paths, max_output_size):
+    os._exit(1)
+
+
+def _get_pid(engine, file_paths, max_output_size):
+    return {file_path: (0, str(os.getpid()), '') for file_path in file_paths}
+
+
+@pytest.fixture
+def daemon_pool():
+    pool = CheckDaemonPool(size=2, max_files=2)
+    yield pool
+    pool.close()
+
+
+class TestCheckDaemonPool:
+    """Test suite for the pool of long-lived check daemons."""
+
+    def test_check_files_returns_the_same_results_as_sequential(self, daemon_pool, tmp_path) -> None:
+        """Test files checked by the daemons get the same results as files checked in a child process."""
+        file_paths = []
+
+        for number in range(3):
+            file_path = tmp_path / f'file_{number}.py'
+            file_path.write_text("print ('Hello, world!')\n" if number % 2 else "print('Hello, world!')\n")
+            file_paths.append(str(file_path))
+
+        assert daemon_pool.check_files(file_paths=file_paths) == SequentialCheckExecutor().check_files(file_paths)
+
+    @patch('code_checker.daemons.check_files_with_output_cap', _get_pid)
+    def test_daemon_is_reused_and_restarted_after_max_files(self, daemon_pool) -> None:
+        """Test a daemon checks the files of several tasks and is replaced after max_files files."""
+        first_pid = daemon_pool.check_files(file_paths=['a.py'])['a.py'][1]
+        second_pid = daemon_pool.check_files(file_paths=['b.py'])['b.py'][1]
+        third_pid = daemon_pool.check_files(file_paths=['c.py'])['c.py'][1]
+
+        assert first_pid == second_pid
+        assert third_pid != first_pid
+
+    @override_settings(CODE_CHECKER_TIMEOUT=0.2)
+    @patch('code_checker.daemons.check_files_with_output_cap', _check_files_slowly)
+    def test_daemon_is_killed_on_timeout(self, daemon_pool) -> None:
+        """Test the daemon is killed after the wall-clock limit and the file gets the timeout result."""
+        started_at = time.monotonic()
+
+        results = daemon_pool.check_files(file_paths=['a.py', 'b.py', 'c.py'])
+
+        assert [results[file_path][0] for file_path in ('a.py', 'b.py', 'c.py')] == [CHECK_TIMEOUT_RETURN_CODE] * 3
+        assert time.monotonic() - started_at < 5
+
+    @patch('code_checker.daemons.check_files_with_output_cap', _crash)
+    def test_daemon_crash(self, daemon_pool) -> None:
+        """Test a crashed daemon fails only its file and is replaced."""
+        results = daemon_pool.check_files(file_paths=['a.py', 'b.py'])
+
+        assert results['a.py'] == (1, '', 'Check daemon died')
+        assert results['b.py'] == (1, '', 'Check daemon died')
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from redis.exceptions import RedisError
+
+from code_checker.dirty_files import (
+    DIRTY_FILES_KEY,
+    POP_DUE_FILES_SCRIPT,
+    forget_dirty_files,
+    mark_files_dirty,
+    pop_due_dirty_files,
+)
+
+MARKED_AT = datetime(2023, 8, 21, 12, 0, tzinfo=timezone.utc)
+
+
+@patch('code_checker.dirty_files.get_redis_connection')
+class TestDirtyFiles:
+    """Test suite for the dirty files set."""
+
+    def test_mark_files_dirty(self, mock_get_redis_connection) -> None:
+        """Test files are added to the sorted set with the mark time as a score."""
+        mark_files_dirty(file_ids=[1, 2], marked_at=MARKED_AT)
+
+        mock_get_redis_connection.return_value.zadd.assert_called_once_with(
+            DIRTY_FILES_KEY,
+            {1: MARKED_AT.timestamp(), 2: MARKED_AT.timestamp()},
+        )
+
+    def test_mark_files_dirty_with_redis_error(self, mock_get_redis_connection) -> None:
+        """Test Redis errors don't break the upload, the files are left to the reconciliation."""
+        mock_get_redis_connection.return_value.zadd.side_effect = RedisError
+
+        mark_files_dirty(file_ids=[1])
+
+    def test_pop_due_dirty_files(self, mock_get_redis_connection) -> None:
+        """Test due files are taken by the script in one Redis command."""
+        mock_register_script = mock_get_redis_connection.return_value.register_script
+        mock_register_script.return_value.return_value = [b'3', b'7']
+
+        file_ids = pop_due_dirty_files(count=10, due_before=MARKED_AT)
+
+        mock_register_script.assert_called_once_with(POP_DUE_FILES_SCRIPT)
+        mock_register_script.return_value.assert_called_once_with(
+            keys=[DIRTY_FILES_KEY],
+            args=[MARKED_AT.timestamp(), 10],
+        )
+        assert file_ids == [3, 7]
+
+    def test_forget_dirty_files(self, mock_get_redis_connection) -> None:
+        """Test checked files are removed from the set and empty lists don't touch Redis."""
+        forget_dirty_files(file_ids=[1, 2])
+        forget_dirty_files(file_ids=[])
+
+        mock_get_redis_connection.return_value.zrem.assert_called_once_with(DIRTY_FILES_KEY, 1, 2)
@@ -0,0 +1,136 @@
+import tokenize
+from unittest.mock import patch
+
+import pytest
+
+from code_checker.engine import Flake8Engine, get_flake8_engine
+from code_checker.sources import SourceFile
+
+
+class TestFlake8Engine:
+    """Test suite for the in-process flake8 engine."""
+
+    def test_check_file_without_problems(self, tmp_path) -> None:
+        """Test checking a clean file returns the same result as the flake8 command line."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text("print('Hello, world!')\n")
+
+        return_code, stdout, stderr = Flake8Engine().check_file(test_file)
+
+        assert return_code == 0
+        assert stdout == ''
+        assert stderr == ''
+
+    def test_check_file_with_problems(self, tmp_path) -> None:
+        """Test checking a file with problems returns flake8 report lines."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text("print ('Hello, world!')\n")
+
+        return_code, stdout, stderr = Flake8Engine().check_file(test_file)
+
+        assert return_code == 1
+        assert stdout == f"{test_file}:1:6: E211 whitespace before '('\n"
+        assert stderr == ''
+
+    def test_engine_is_reused_between_checks(self, tmp_path) -> None:
+        """Test results of the previous check do not leak into the next one."""
+        bad_file = tmp_path / 'bad_file.py'
+        bad_file.write_text("print ('Hello, world!')\n")
+        good_file = tmp_path / 'good_file.py'
+        good_file.write_text("print('Hello, world!')\n")
+
+        engine = get_flake8_engine()
+        engine.check_file(bad_file)
+
+        assert engine is get_flake8_engine()
+        assert engine.check_file(good_file) == (0, '', '')
+
+    def test_check_non_existent_file(self, tmp_path) -> None:
+        """Test checking a non-existent file reports E902."""
+        non_existent_file = tmp_path / 'non_existent_file.py'
+
+        return_code, stdout, stderr = Flake8Engine().check_file(non_existent_file)
+
+        assert return_code == 1
+        assert 'E902' in stdout
+        assert 'No such file or directory' in stdout
+        assert stderr == ''
+
+    def test_check_files_splits_output_per_file(self, tmp_path) -> None:
+        """Test checking several files in one run returns the result of every file separately."""
+        bad_file = tmp_path / 'bad_file.py'
+        bad_file.write_text("print ('Hello, world!')\n")
+        good_file = tmp_path / 'good_file.py'
+        good_file.write_text("print('Hello, world!')\n")
+
+        results = Flake8Engine().check_files([bad_file, good_file])
+
+        assert results[str(bad_file)] == (1, f"{bad_file}:1:6: E211 whitespace before '('\n", '')
+        assert results[str(good_file)] == (0, '', '')
+
+    @pytest.mark.parametrize(
+        'content',
+        [
+            b'def f(:\n    pass\n',
+            b'x = 1\n  y = 2\n',
+            b'x = (\n',
+            b'\xff\xfe\x00junk\x89PNG',
+            b'def f(:  # noqa\n    pass\n',
+        ],
+    )
+    def test_preflight_file_reports_the_same_error_as_flake8(self, tmp_path, content) -> None:
+        """Test a broken file gets the same result from the preflight check as from the full flake8 run."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_bytes(content)
+        engine = get_flake8_engine()
+
+        assert engine.preflight_file(test_file) == engine.check_file(test_file)
+
+    def test_preflight_file_with_valid_file(self, tmp_path) -> None:
+        """Test a file that can be parsed is left to the full check, even with a wrong encoding."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_bytes(b"# -*- coding: utf-8 -*-\nprint ('\xff')\n")
+
+        assert get_flake8_engine().preflight_file(test_file) is None
+
+    def test_preflight_non_existent_file(self, tmp_path) -> None:
+        """Test a file that can't be read gets the E902 error."""
+        test_file = tmp_path / 'missing.py'
+
+        return_code, stdout, _ = get_flake8_engine().preflight_file(test_file)
+
+        assert return_code == 1
+        assert 'E902 FileNotFoundError' in stdout
+
+    def test_check_files_reuses_parsed_source(self, tmp_path) -> None:
+        """Test the full check takes the tokens and AST computed before instead of parsing the file again."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text("print ('Hello, world!')\n")
+        source = SourceFile(test_file)
+        engine = get_flake8_engine()
+
+        assert engine.preflight_file(test_file, source=source) is None
+        assert source.tokens
+
+        with patch('code_checker.sources.ast.parse') as mock_parse:
+            results = engine.check_files(file_paths=[test_file], sources={str(test_file): source})
+
+        mock_parse.assert_not_called()
+        assert results == engine.check_files(file_paths=[test_file])
+
+    def test_check_files_tokenizes_shared_source_once(self, tmp_path) -> None:
+        """Test the tokens of the source are shared by the noqa mapping and the token checks."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text("print ('Hello, world!')\n")
+        source = SourceFile(test_file)
+        assert source.tokens
+        engine = get_flake8_engine()
+
+        with patch('tokenize.generate_tokens', wraps=tokenize.generate_tokens) as mock_tokenize:
+            engine.check_files(file_paths=[test_file], sources={str(test_file): source})
+            shared_calls = mock_tokenize.call_count
+            mock_tokenize.reset_mock()
+            engine.check_files(file_paths=[test_file])
+
+        # Plugins tokenizing the lines themselves are the same in both runs, only a new source tokenizes once more
+        assert mock_tokenize.call_count == shared_calls + 1
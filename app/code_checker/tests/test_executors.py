@@ -0,0 +1,144 @@
+import asyncio
+import importlib
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from config.settings import code_checker as code_checker_settings
+
+from code_checker.daemons import CheckDaemonPool
+from code_checker.executors import (
+    OUTPUT_CHUNK_SIZE,
+    ProcessPoolCheckExecutor,
+    SequentialCheckExecutor,
+    SubprocessCheckExecutor,
+    _read_output,
+    get_check_executor,
+)
+from code_checker.isolation import IsolatedProcess
+from code_checker.utils import CHECK_TIMEOUT_RETURN_CODE
+
+
+def _check_files_slowly(file_paths):
+    if 'slow.py' in file_paths:
+        time.sleep(10)
+
+    return {file_path: (0, '', '') for file_path in file_paths}
+
+
+def _start_slow_check_process(file_paths, sources):
+    return IsolatedProcess(
+        func=_check_files_slowly,
+        timeout=0.2,
+        memory_limit=0,
+        max_result_size=1024,
+        file_paths=file_paths,
+    )
+
+
+class TestCheckExecutors:
+    """Test suite for the executors checking files of one task."""
+
+    def test_process_pool_executor_returns_the_same_results_as_sequential(self, tmp_path) -> None:
+        """Test files checked in parallel get the same results as files checked one after another."""
+        file_paths = []
+
+        for number in range(5):
+            file_path = tmp_path / f'file_{number}.py'
+            file_path.write_text("print ('Hello, world!')\n" if number % 2 else "print('Hello, world!')\n")
+            file_paths.append(str(file_path))
+
+        results = ProcessPoolCheckExecutor(max_workers=2).check_files(file_paths=file_paths)
+
+        assert results == SequentialCheckExecutor().check_files(file_paths=file_paths)
+        assert [results[file_path][0] for file_path in file_paths] == [0, 1, 0, 1, 0]
+
+    def test_subprocess_executor_returns_the_same_results_as_sequential(self, tmp_path) -> None:
+        """Test files checked by flake8 subprocesses get the same results as files checked in the worker."""
+        file_paths = []
+
+        for number in range(3):
+            file_path = tmp_path / f'file_{number}.py'
+            file_path.write_text("print ('Hello, world!')\n" if number % 2 else "print('Hello, world!')\n")
+            file_paths.append(str(file_path))
+
+        results = SubprocessCheckExecutor(max_workers=2).check_files(file_paths=file_paths)
+
+        assert results == SequentialCheckExecutor().check_files(file_paths=file_paths)
+
+    @override_settings(CODE_CHECKER_TIMEOUT=0.01)
+    def test_subprocess_executor_with_timeout(self, tmp_path) -> None:
+        """Test the subprocess is killed after the time limit and the file gets the timeout result."""
+        file_path = tmp_path / 'file.py'
+        file_path.write_text("print('Hello, world!')\n")
+
+        results = SubprocessCheckExecutor(max_workers=1).check_files(file_paths=[file_path])
+
+        assert results[str(file_path)][0] == CHECK_TIMEOUT_RETURN_CODE
+
+    def test_read_output_with_long_lines(self) -> None:
+        """Test a line longer than the stream buffer is read, and the output is cut after the last whole line."""
+        long_line = 'x' * OUTPUT_CHUNK_SIZE * 2 + '\n'
+
+        async def read_output(max_output_size):
+            stream = asyncio.StreamReader()
+            stream.feed_data((long_line * 3).encode())
+            stream.feed_eof()
+            return await _read_output(stream=stream, max_output_size=max_output_size, file_path='file.py')
+
+        assert asyncio.run(read_output(max_output_size=len(long_line) * 3)) == long_line * 3
+        assert asyncio.run(read_output(max_output_size=len(long_line) * 2 + 1)) == long_line * 2
+
+    @patch('code_checker.executors.start_flake8_process', side_effect=_start_slow_check_process)
+    def test_process_pool_executor_checks_failed_chunk_one_by_one(self, mock_start_flake8_process) -> None:
+        """Test only the file that runs out of time fails, the rest of its chunk is checked again."""
+        results = ProcessPoolCheckExecutor(max_workers=2).check_files(file_paths=['a.py', 'slow.py', 'b.py', 'c.py'])
+
+        assert results['a.py'] == (0, '', '')
+        assert results['b.py'] == (0, '', '')
+        assert results['c.py'] == (0, '', '')
+        assert results['slow.py'][0] == CHECK_TIMEOUT_RETURN_CODE
+        assert mock_start_flake8_process.call_count == 4
+
+    @pytest.mark.parametrize(
+        'executor',
+        [
+            ProcessPoolCheckExecutor(max_workers=2),
+            SubprocessCheckExecutor(max_workers=2),
+            CheckDaemonPool(size=2, max_files=10),
+        ],
+    )
+    def test_executor_without_files(self, executor) -> None:
+        """Test an executor returns no results for no files without starting any process."""
+        assert executor.check_files(file_paths=[]) == {}
+
+    @pytest.mark.parametrize(
+        'executor_name, executor_class',
+        [
+            ('sequential', SequentialCheckExecutor),
+            ('process_pool', ProcessPoolCheckExecutor),
+            ('subprocess', SubprocessCheckExecutor),
+            ('daemon_pool', CheckDaemonPool),
+        ],
+    )
+    def test_get_check_executor(self, executor_name, executor_class) -> None:
+        """Test the executor is selected by the CODE_CHECKER_EXECUTOR setting."""
+        with override_settings(CODE_CHECKER_EXECUTOR=executor_name, CODE_CHECKER_EXECUTOR_WORKERS=3):
+            assert isinstance(get_check_executor(), executor_class)
+
+    def test_subprocess_executor_with_other_backend(self, monkeypatch) -> None:
+        """Test the settings reject the subprocess executor with a backend other than flake8."""
+        monkeypatch.setenv('CODE_CHECKER_EXECUTOR', 'subprocess')
+        monkeypatch.setenv('CODE_CHECKER_BACKEND', 'ruff')
+
+        with pytest.raises(ImproperlyConfigured):
+            importlib.reload(code_checker_settings)
+
+        monkeypatch.setenv('CODE_CHECKER_BACKEND', 'flake8_subprocess')
+        importlib.reload(code_checker_settings)
+
+        monkeypatch.undo()
+        importlib.reload(code_checker_settings)
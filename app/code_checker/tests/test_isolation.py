@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from code_checker.isolation import (
+    IsolatedProcess,
+    IsolatedRunError,
+    IsolatedRunTimeoutError,
+    run_isolated,
+    wait_isolated,
+)
+
+
+def _add(first, second):
+    return first + second
+
+
+def _fail():
+    raise ValueError('Broken file')
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+
+
+def _allocate(size):
+    return len(bytearray(size))
+
+
+class TestRunIsolated:
+    """Test suite for running functions in a limited child process."""
+
+    def test_run_isolated_returns_result(self) -> None:
+        """Test the result of the function is sent back from the child process."""
+        assert run_isolated(func=_add, timeout=5, memory_limit=0, max_result_size=1024, first=2, second=3) == 5
+
+    def test_run_isolated_with_exception(self) -> None:
+        """Test an exception in the child process is raised as IsolatedRunError."""
+        with pytest.raises(IsolatedRunError, match='ValueError: Broken file'):
+            run_isolated(func=_fail, timeout=5, memory_limit=0, max_result_size=1024)
+
+    def test_run_isolated_with_timeout(self) -> None:
+        """Test the child process is killed after the wall-clock limit."""
+        started_at = time.monotonic()
+
+        with pytest.raises(IsolatedRunTimeoutError):
+            run_isolated(func=_sleep, timeout=0.2, memory_limit=0, max_result_size=1024, seconds=10)
+
+        assert time.monotonic() - started_at < 5
+
+    def test_run_isolated_with_memory_limit(self) -> None:
+        """Test the child process can't allocate more memory than the limit."""
+        with pytest.raises(IsolatedRunError, match='MemoryError'):
+            run_isolated(func=_allocate, timeout=5, memory_limit=64 * 1024 * 1024, max_result_size=1024, size=2**30)
+
+    def test_run_isolated_with_too_large_result(self) -> None:
+        """Test the child process is killed when its result is larger than the limit."""
+        with pytest.raises(IsolatedRunError, match='larger than'):
+            run_isolated(func=_add, timeout=5, memory_limit=0, max_result_size=1024, first='a' * 4096, second='')
+
+    def test_wait_isolated_returns_processes_as_they_finish(self) -> None:
+        """Test several child processes run at the same time and the fast one is collected first."""
+        slow_process = IsolatedProcess(func=_sleep, timeout=5, memory_limit=0, max_result_size=1024, seconds=0.5)
+        fast_process = IsolatedProcess(func=_add, timeout=5, memory_limit=0, max_result_size=1024, first=2, second=3)
+        running = [slow_process, fast_process]
+        finished = []
+
+        while running:
+            for process in wait_isolated(processes=running):
+                running.remove(process)
+                finished.append(process)
+
+        for process in finished:
+            process.close()
+
+        assert finished == [fast_process, slow_process]
+        assert fast_process.result() == 5
+        assert slow_process.result() is None
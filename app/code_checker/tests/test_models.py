@@ -1,7 +1,7 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
 from pytest_django.asserts import TestCase
 
-from code_checker.models import CheckLog, CodeCheck, CodeCheckStatus
+from code_checker.models import CheckLog, CheckViolation, CodeCheck, CodeCheckStatus
 from code_files.models import UploadedFile
 from users.models import User
 
@@ -29,7 +29,7 @@ class CodeCheckTest(BaseSetup):
 
     def test_create_code_check(self) -> None:
         """Test creating a CodeCheck instance."""
-        assert self.code_check.status == CodeCheckStatus.UNCHECKED.name
+        assert self.code_check.status == CodeCheckStatus.UNCHECKED.value
         assert self.code_check.last_check_result == 'Without problems'
         assert not self.code_check.is_notified
 
@@ -44,13 +44,13 @@ class CodeCheckTest(BaseSetup):
 
     def test_update_code_check_status_to_in_checking(self) -> None:
         """Test updating a CodeCheck status to in checking."""
-        self.code_check.status = CodeCheckStatus.IN_CHECKING.name
-        assert self.code_check.status == CodeCheckStatus.IN_CHECKING.name
+        self.code_check.status = CodeCheckStatus.IN_CHECKING.value
+        assert self.code_check.status == CodeCheckStatus.IN_CHECKING.value
 
     def test_update_code_check_status_to_done(self) -> None:
         """Test updating a CodeCheck status to done."""
-        self.code_check.status = CodeCheckStatus.DONE.name
-        assert self.code_check.status == CodeCheckStatus.DONE.name
+        self.code_check.status = CodeCheckStatus.DONE.value
+        assert self.code_check.status == CodeCheckStatus.DONE.value
 
     def test_update_code_check_last_check_result(self) -> None:
         """Test updating a CodeCheck last_check_result to custom result."""
@@ -92,3 +92,36 @@ class CheckLogTest(BaseSetup):
         log.delete()
 
         assert CheckLog.objects.filter(code_check=self.code_check).count() == 0
+
+
+class CheckViolationTest(BaseSetup):
+    """Test suite for the CheckViolation model."""
+
+    def test_check_violation_create(self) -> None:
+        """Test creating a CheckViolation instance."""
+        violation = CheckViolation.objects.create(
+            code_check=self.code_check,
+            filename='test_file4.py',
+            line=10,
+            column=5,
+            error_code='E211',
+            error_text="whitespace before '('",
+        )
+
+        assert violation.location == 'test_file4.py:10:5'
+        assert list(self.code_check.checkviolation_set.all()) == [violation]
+
+    def test_check_violation_delete_with_code_check(self) -> None:
+        """Test deleting a CodeCheck deletes its violations."""
+        CheckViolation.objects.create(
+            code_check=self.code_check,
+            filename='test_file4.py',
+            line=1,
+            column=1,
+            error_code='F401',
+            error_text="'os' imported but unused",
+        )
+
+        self.code_check.delete()
+
+        assert CheckViolation.objects.count() == 0
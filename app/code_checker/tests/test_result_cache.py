@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+
+from code_checker.result_cache import (
+    CACHE_HITS_KEY,
+    CACHE_MISSES_KEY,
+    cache_results,
+    get_cached_results,
+)
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class TestResultCache:
+    """Test suite for the flake8 result cache."""
+
+    @pytest.fixture(autouse=True)
+    def locmem_cache(self, settings) -> None:
+        """Use an empty local memory cache instead of Redis."""
+        settings.CACHES = LOCMEM_CACHES
+        cache.clear()
+
+    def test_cached_result_is_shared_by_name_and_content(self) -> None:
+        """Test the result of one file is returned for a file of another user with the same name and content."""
+        cache_results(
+            results={'/user_1/code/main.py': (1, "/user_1/code/main.py:1:6: E211 whitespace before '('\n", '')},
+            content_hashes={'/user_1/code/main.py': 'content-hash'},
+        )
+
+        results = get_cached_results(content_hashes={'/user_2/code/main.py': 'content-hash'})
+
+        assert results == {
+            '/user_2/code/main.py': (1, "/user_2/code/main.py:1:6: E211 whitespace before '('\n", ''),
+        }
+        assert cache.get(CACHE_HITS_KEY) == 1
+
+    def test_cached_result_is_not_shared_by_other_name(self) -> None:
+        """Test the result of one file isn't returned for a file with the same content and another name."""
+        cache_results(
+            results={'/user_1/code/logging.py': (1, '/user_1/code/logging.py:1:1: A005 shadowing\n', '')},
+            content_hashes={'/user_1/code/logging.py': 'content-hash'},
+        )
+
+        assert get_cached_results(content_hashes={'/user_2/code/main.py': 'content-hash'}) == {}
+
+    def test_failed_result_is_not_cached(self) -> None:
+        """Test results with stderr are not saved to the cache."""
+        cache_results(
+            results={'/user_1/code/first.py': (1, '', 'Engine error')},
+            content_hashes={'/user_1/code/first.py': 'content-hash'},
+        )
+
+        assert get_cached_results(content_hashes={'/user_1/code/first.py': 'content-hash'}) == {}
+        assert cache.get(CACHE_MISSES_KEY) == 1
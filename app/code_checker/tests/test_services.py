@@ -1,31 +1,42 @@
+from datetime import timedelta
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from code_checker.code_checker_services import (
     _generate_message_for_email,
     _generate_path_to_user_file,
     _generate_str_with_checked_files,
-    get_users_files_with_new_or_overwritten_state,
+    check_user_files,
+    claim_code_checks,
+    get_files_with_new_or_overwritten_state,
+    group_files_by_user,
 )
-from code_checker.models import CodeCheck
-from code_checker.utils import run_flake8
+from code_checker.models import CheckLog, CheckViolation, CodeCheck, CodeCheckStatus
+from code_checker.utils import run_flake8, run_flake8_batch
+from code_checker.tests.test_result_cache import LOCMEM_CACHES
 from code_files.models import FileState
 from code_files.models import UploadedFile
 from users.models import User
 
 
+@override_settings(CACHES=LOCMEM_CACHES, CODE_CHECKER_EXECUTOR='sequential')
 class TestCodeCheckerServices(TestCase):
 
     def setUp(self) -> None:
         """Set up the necessary objects for testing."""
+        cache.clear()
         self.user_instance = User.objects.create_user(email='mrrobot@example.com', password='testpassword')
         self.uploaded_file = UploadedFile.objects.create(
             user=self.user_instance,
-            file=SimpleUploadedFile('test_file4.py', b'Test file content'),
+            file=SimpleUploadedFile('test_file4.py', b"print('Test file content')\n"),
             filename='test_file4.py',
         )
         self.code_check = CodeCheck.objects.create(file=self.uploaded_file)
@@ -36,10 +47,13 @@ class TestCodeCheckerServices(TestCase):
         self.uploaded_file.delete()
         self.user_instance.delete()
 
-    @patch('code_checker.utils.subprocess.run')
-    def test_run_flake8(self, mock_subprocess_run) -> None:
+    @patch('code_checker.utils.get_check_backend')
+    def test_run_flake8(self, mock_get_flake8_engine) -> None:
         """Test for run_flake8 function from utils."""
-        mock_subprocess_run.return_value = Mock(returncode=0, stdout='', stderr='')
+        mock_get_flake8_engine.return_value = Mock(
+            check_files=Mock(return_value={'path/to/file.py': (0, '', '')}),
+            preflight_file=Mock(return_value=None),
+        )
 
         return_code, stdout, stderr = run_flake8('path/to/file.py')
 
@@ -47,38 +61,226 @@ class TestCodeCheckerServices(TestCase):
         assert stdout == ''
         assert stderr == ''
 
-    def test_get_users_files_with_new_or_overwritten_state(self) -> None:
-        """Test get_users_files_with_new_or_overwritten_state function return only NEW and OVERWRITTEN files."""
+    @patch('code_checker.utils.get_check_backend')
+    def test_run_flake8_batch_on_engine_error(self, mock_get_flake8_engine) -> None:
+        """Test run_flake8_batch checks files one by one and returns the error for every file when the engine fails."""
+        mock_get_flake8_engine.return_value = Mock(
+            check_files=Mock(side_effect=RuntimeError('Engine error')),
+            preflight_file=Mock(return_value=None),
+        )
+
+        results = run_flake8_batch(['path/to/file.py', 'path/to/file2.py'])
+
+        assert results == {
+            'path/to/file.py': (1, '', 'RuntimeError: Engine error'),
+            'path/to/file2.py': (1, '', 'RuntimeError: Engine error'),
+        }
+
+    def test_claim_code_checks(self) -> None:
+        """Test claimed checks are moved to in checking and are not claimed twice."""
+
+        claimed = claim_code_checks(uploaded_files=[self.uploaded_file])
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert claimed == [self.code_check]
+        assert code_check.status == CodeCheckStatus.IN_CHECKING.value
+        assert code_check.claimed_at is not None
+        assert claim_code_checks(uploaded_files=[self.uploaded_file]) == []
+
+    @override_settings(CODE_CHECKER_LEASE_TIMEOUT=60)
+    def test_claim_code_checks_with_expired_lease(self) -> None:
+        """Test checks left in checking longer than the lease timeout are claimed again."""
+        self.code_check.status = CodeCheckStatus.IN_CHECKING.value
+        self.code_check.claimed_at = timezone.now() - timedelta(seconds=61)
+        self.code_check.save()
+
+        assert claim_code_checks(uploaded_files=[self.uploaded_file]) == [self.code_check]
+
+    @patch('code_checker.executors.run_flake8_batch')
+    def test_check_user_files(self, mock_run_flake8_batch) -> None:
+        """Test check_user_files checks all files in one batch and saves the result of every file."""
+        absolute_file_path, _ = _generate_path_to_user_file(self.uploaded_file)
+        mock_run_flake8_batch.return_value = {
+            str(absolute_file_path): (1, f'{absolute_file_path}:1:2: E999 SyntaxError: invalid syntax\n', ''),
+        }
+
+        result = check_user_files(uploaded_files=[self.uploaded_file])
+
+        mock_run_flake8_batch.assert_called_once_with(file_paths=[str(absolute_file_path)], sources=ANY)
+
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert result.code_check_objects_id == [self.code_check.id]
+        assert code_check.status == CodeCheckStatus.DONE.value
+        assert code_check.last_check_result == f'{absolute_file_path}:1:2: E999 SyntaxError: invalid syntax\n'
+        assert list(CheckViolation.objects.values_list('filename', 'line', 'column', 'error_code', 'error_text')) == [
+            ('test_file4.py', 1, 2, 'E999', 'SyntaxError: invalid syntax'),
+        ]
+        assert UploadedFile.objects.get(pk=self.uploaded_file.pk).state == FileState.OLD.value
+        assert CheckLog.objects.filter(code_check=self.code_check).count() == 1
+
+    @override_settings(CODE_CHECKER_BACKEND='unknown')
+    def test_check_user_files_with_unavailable_backend(self) -> None:
+        """Test claimed checks are failed and retried later when the checker backend can't run."""
+        check_user_files(uploaded_files=[self.uploaded_file])
+
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert code_check.status == CodeCheckStatus.UNCHECKED.value
+        assert code_check.attempts == 1
+        assert code_check.next_attempt_at is not None
+
+    def test_check_user_files_with_broken_file(self) -> None:
+        """Test a file that can't be parsed gets the E999 error from the preflight check in the check process."""
+        broken_file = UploadedFile.objects.create(
+            user=self.user_instance,
+            file=SimpleUploadedFile('broken_file.py', b'Test file content'),
+            filename='broken_file.py',
+        )
+        code_check = CodeCheck.objects.create(file=broken_file, status=CodeCheckStatus.UNCHECKED.value)
+
+        check_user_files(uploaded_files=[broken_file])
+
+        assert CodeCheck.objects.get(pk=code_check.pk).status == CodeCheckStatus.DONE.value
+        assert list(CheckViolation.objects.filter(code_check=code_check).values_list('error_code', flat=True)) == [
+            'E999',
+        ]
+
+        broken_file.file.delete()
+
+    @patch('code_checker.executors.run_flake8_batch')
+    def test_check_user_files_query_count_does_not_depend_on_files_count(self, mock_run_flake8_batch) -> None:
+        """Test check_user_files saves results of any number of files with the same number of queries."""
+        mock_run_flake8_batch.side_effect = lambda file_paths, sources: dict.fromkeys(file_paths, (0, '', ''))
+
+        with CaptureQueriesContext(connection) as single_file_queries:
+            check_user_files(uploaded_files=[self.uploaded_file])
+
+        uploaded_files = [
+            UploadedFile.objects.create(
+                user=self.user_instance,
+                file=SimpleUploadedFile(f'test_file_{number}.py', f'print({number})'.encode()),
+                filename=f'test_file_{number}.py',
+            )
+            for number in range(3)
+        ]
+        for uploaded_file in uploaded_files:
+            CodeCheck.objects.create(file=uploaded_file, status=CodeCheckStatus.UNCHECKED.value)
+
+        with CaptureQueriesContext(connection) as several_files_queries:
+            result = check_user_files(uploaded_files=uploaded_files)
+
+        assert len(result.checked_files) == 3
+        assert len(several_files_queries) == len(single_file_queries)
+        assert CheckLog.objects.filter(code_check__file__in=uploaded_files).count() == 3
+
+        for uploaded_file in uploaded_files:
+            uploaded_file.file.delete()
+
+    @patch('code_checker.executors.run_flake8_batch')
+    def test_check_user_files_with_cached_result(self, mock_run_flake8_batch) -> None:
+        """Test check_user_files does not run flake8 for a file content checked before."""
+        absolute_file_path, _ = _generate_path_to_user_file(self.uploaded_file)
+        mock_run_flake8_batch.return_value = {str(absolute_file_path): (0, '', '')}
+
+        check_user_files(uploaded_files=[self.uploaded_file])
+        CodeCheck.objects.filter(pk=self.code_check.pk).update(status=CodeCheckStatus.UNCHECKED.value)
+        check_user_files(uploaded_files=[self.uploaded_file])
+
+        mock_run_flake8_batch.assert_called_once()
+        assert CodeCheck.objects.get(pk=self.code_check.pk).status == CodeCheckStatus.DONE.value
+
+    @override_settings(CODE_CHECKER_MAX_ATTEMPTS=3, CODE_CHECKER_RETRY_DELAY=60)
+    @patch('code_checker.executors.run_flake8_batch')
+    def test_check_user_files_retries_failed_check_with_backoff(self, mock_run_flake8_batch) -> None:
+        """Test a failed check is retried only when its next attempt is due and the delay doubles."""
+        absolute_file_path, _ = _generate_path_to_user_file(self.uploaded_file)
+        mock_run_flake8_batch.return_value = {str(absolute_file_path): (1, '', 'flake8 crashed')}
+
+        result = check_user_files(uploaded_files=[self.uploaded_file])
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert result.checked_files == []
+        assert code_check.status == CodeCheckStatus.UNCHECKED.value
+        assert code_check.attempts == 1
+        assert timedelta(seconds=59) < code_check.next_attempt_at - timezone.now() <= timedelta(seconds=60)
+
+        check_user_files(uploaded_files=[self.uploaded_file])
+        mock_run_flake8_batch.assert_called_once()
+
+        CodeCheck.objects.filter(pk=self.code_check.pk).update(next_attempt_at=timezone.now())
+        check_user_files(uploaded_files=[self.uploaded_file])
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert code_check.attempts == 2
+        assert timedelta(seconds=119) < code_check.next_attempt_at - timezone.now() <= timedelta(seconds=120)
+
+    @override_settings(CODE_CHECKER_MAX_ATTEMPTS=3, CODE_CHECKER_SWEEP_DELAY=0)
+    @patch('code_checker.executors.run_flake8_batch')
+    def test_check_user_files_quarantines_check_after_max_attempts(self, mock_run_flake8_batch) -> None:
+        """Test a check that keeps failing is quarantined and no longer picked up."""
+        absolute_file_path, _ = _generate_path_to_user_file(self.uploaded_file)
+        mock_run_flake8_batch.return_value = {str(absolute_file_path): (1, '', 'flake8 crashed')}
+        CodeCheck.objects.filter(pk=self.code_check.pk).update(attempts=2)
+
+        check_user_files(uploaded_files=[self.uploaded_file])
+        code_check = CodeCheck.objects.get(pk=self.code_check.pk)
+
+        assert code_check.status == CodeCheckStatus.QUARANTINED.value
+        assert code_check.attempts == 3
+        assert code_check.next_attempt_at is None
+        assert claim_code_checks(uploaded_files=[self.uploaded_file]) == []
+        assert list(get_files_with_new_or_overwritten_state()) == []
+
+    def test_get_files_without_recently_uploaded_files(self) -> None:
+        """Test get_files_with_new_or_overwritten_state leaves just uploaded files to the upload check."""
+        assert list(get_files_with_new_or_overwritten_state()) == []
+
+    @override_settings(CODE_CHECKER_SWEEP_DELAY=0)
+    def test_get_files_with_new_or_overwritten_state(self) -> None:
+        """Test get_files_with_new_or_overwritten_state function return only NEW and OVERWRITTEN files."""
         uploaded_file1 = UploadedFile.objects.create(
             file=SimpleUploadedFile('test_file1.py', b'Test file content'),
             user=self.user_instance,
-            state=FileState.NEW.value,
+            state=FileState.OVERWRITTEN.value,
         )
         uploaded_file2 = UploadedFile.objects.create(
             file=SimpleUploadedFile('test_file2.py', b'Test file2 content'),
             user=self.user_instance,
-            state=FileState.OVERWRITTEN.value,
+            state=FileState.OLD.value,
+        )
+
+        file_ids = get_files_with_new_or_overwritten_state()
+
+        assert sorted(file_ids) == [self.uploaded_file.pk, uploaded_file1.pk]
+
+        uploaded_file1.file.delete()
+        uploaded_file2.file.delete()
+
+    def test_group_files_by_user(self) -> None:
+        """Test group_files_by_user groups files waiting for the check by the owner email."""
+        other_user = User.objects.create_user(email='elliot@example.com', password='testpassword')
+        uploaded_file1 = UploadedFile.objects.create(
+            file=SimpleUploadedFile('test_file1.py', b'Test file content'),
+            user=other_user,
         )
-        uploaded_file3 = UploadedFile.objects.create(
-            file=SimpleUploadedFile('test_file3.py', b'Test file2 content'),
+        uploaded_file2 = UploadedFile.objects.create(
+            file=SimpleUploadedFile('test_file2.py', b'Test file2 content'),
             user=self.user_instance,
             state=FileState.OLD.value,
         )
 
-        users_with_files = get_users_files_with_new_or_overwritten_state()
-        assert users_with_files.count() == 1
-
-        get_user_with_files = users_with_files[0]
+        file_ids = [self.uploaded_file.pk, uploaded_file1.pk, uploaded_file2.pk]
 
-        assert get_user_with_files.email == self.user_instance.email
+        grouped_files = list(group_files_by_user(file_ids=file_ids))
 
-        assert uploaded_file1 in get_user_with_files.filtered_files
-        assert uploaded_file2 in get_user_with_files.filtered_files
-        assert uploaded_file3 not in get_user_with_files.filtered_files
+        assert grouped_files == [
+            (self.user_instance.email, [self.uploaded_file.pk]),
+            (other_user.email, [uploaded_file1.pk]),
+        ]
 
         uploaded_file1.file.delete()
         uploaded_file2.file.delete()
-        uploaded_file3.file.delete()
 
     def test_generate_path_to_user_file(self) -> None:
         """Test for _generate_path_to_user_file function."""
@@ -0,0 +1,51 @@
+import ast
+from unittest.mock import patch
+
+from code_checker.sources import SourceFile
+
+
+class TestSourceFile:
+    """Test suite for the uploaded file shared by the check stages."""
+
+    def test_content_hash(self, tmp_path) -> None:
+        """Test files with the same content have the same hash."""
+        first_file = tmp_path / 'first.py'
+        first_file.write_bytes(b'print(1)\n')
+        second_file = tmp_path / 'second.py'
+        second_file.write_bytes(b'print(1)\n')
+
+        assert SourceFile(first_file).content_hash == SourceFile(second_file).content_hash
+        assert SourceFile(tmp_path / 'non_existent_file.py').content_hash is None
+
+    @patch('code_checker.sources.MMAP_MIN_SIZE', 16)
+    def test_large_file_is_memory_mapped(self, tmp_path) -> None:
+        """Test a large file is memory-mapped and decoded the same way as a small one."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_bytes(b'x = 1\r\ny = 2\n' * 4)
+
+        source = SourceFile(test_file)
+
+        assert not isinstance(source.content, bytes)
+        assert source.lines == ('x = 1\n', 'y = 2\n') * 4
+
+    def test_lines_are_decoded_like_flake8(self, tmp_path) -> None:
+        """Test the BOM is stripped and a file with a wrong encoding is decoded as latin-1."""
+        utf8_file = tmp_path / 'utf8.py'
+        utf8_file.write_bytes(b'\xef\xbb\xbfx = 1\n')
+        broken_file = tmp_path / 'broken.py'
+        broken_file.write_bytes(b'# -*- coding: utf-8 -*-\nx = "\xff"\n')
+
+        assert SourceFile(utf8_file).lines == ('x = 1\n',)
+        assert SourceFile(broken_file).lines == ('# -*- coding: utf-8 -*-\n', 'x = "\xff"\n')
+
+    def test_file_is_read_and_parsed_once(self, tmp_path) -> None:
+        """Test the tokens and AST are computed once and reused."""
+        test_file = tmp_path / 'test_file.py'
+        test_file.write_text('x = 1\n')
+        source = SourceFile(test_file)
+
+        with patch('code_checker.sources.ast.parse', wraps=ast.parse) as mock_parse:
+            assert source.tree is source.tree
+
+        assert source.tokens is source.tokens
+        mock_parse.assert_called_once()
@@ -0,0 +1,178 @@
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+from kombu.exceptions import OperationalError
+from redis.exceptions import LockError
+
+from code_checker.tasks import (
+    check_backend_available,
+    check_files_batch,
+    dispatch_user_checks,
+    notify_user_about_checks,
+    reconcile_dirty_files,
+    run_flake8_checker,
+)
+
+
+class TestCodeCheckerTasks:
+    """Test suite for the code checker tasks."""
+
+    @pytest.fixture(autouse=True)
+    def mock_cache(self):
+        """Replace the Redis cache that holds the lock of the flake8 checker runs."""
+        with patch('code_checker.tasks.cache') as mock_cache:
+            mock_cache.lock.return_value.acquire.return_value = True
+            self.mock_lock = mock_cache.lock.return_value
+            yield
+
+    @override_settings(CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE=2)
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files')
+    def test_run_flake8_checker(self, mock_pop_due_dirty_files, mock_group_files_by_user, mock_dispatch) -> None:
+        """Test the dirty files set is drained in chunks and files are dispatched per user."""
+        mock_pop_due_dirty_files.side_effect = [[1, 2], [3], []]
+        mock_group_files_by_user.side_effect = lambda file_ids: [('mrrobot@example.com', file_ids)]
+
+        run_flake8_checker()
+
+        assert mock_pop_due_dirty_files.call_count == 3
+        assert {call.kwargs['count'] for call in mock_pop_due_dirty_files.call_args_list} == {2}
+        assert [call.kwargs for call in mock_dispatch.call_args_list] == [
+            {'user_email': 'mrrobot@example.com', 'file_ids': [1, 2]},
+            {'user_email': 'mrrobot@example.com', 'file_ids': [3]},
+        ]
+
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files', return_value=[])
+    def test_run_flake8_checker_without_dirty_files(self, mock_pop, mock_group_files_by_user, mock_dispatch) -> None:
+        """Test an idle run only asks Redis for the dirty files."""
+        run_flake8_checker()
+
+        mock_pop.assert_called_once()
+        mock_group_files_by_user.assert_not_called()
+        mock_dispatch.assert_not_called()
+
+    @override_settings(CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE=2, CODE_CHECKER_MAX_FILES_PER_RUN=3)
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files')
+    def test_run_flake8_checker_stops_after_max_files(self, mock_pop, mock_group_files_by_user, mock_dispatch) -> None:
+        """Test one run dispatches at most CODE_CHECKER_MAX_FILES_PER_RUN files."""
+        mock_pop.side_effect = lambda count, due_before: list(range(count))
+        mock_group_files_by_user.side_effect = lambda file_ids: [('mrrobot@example.com', file_ids)]
+
+        run_flake8_checker()
+
+        assert [call.kwargs['count'] for call in mock_pop.call_args_list] == [2, 1]
+        assert mock_dispatch.call_count == 2
+
+    def test_check_backend_available_stops_worker(self) -> None:
+        """Test the worker doesn't start with a checker backend that can't run."""
+        with override_settings(CODE_CHECKER_BACKEND='unknown'), pytest.raises(SystemExit):
+            check_backend_available()
+
+    @patch('code_checker.tasks.mark_files_dirty')
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files', return_value=[1, 2, 3])
+    def test_run_flake8_checker_dispatch_error(self, mock_pop, mock_group, mock_dispatch, mock_mark) -> None:
+        """Test the taken files not dispatched because of an error are marked dirty again."""
+        mock_group.return_value = [('first@example.com', [1, 3]), ('second@example.com', [2])]
+        mock_dispatch.side_effect = [None, OperationalError('Error 111 connecting to redis:6379')]
+
+        with pytest.raises(OperationalError):
+            run_flake8_checker()
+
+        mock_mark.assert_called_once_with(file_ids=[2], marked_at=mock_pop.call_args.kwargs['due_before'])
+        self.mock_lock.release.assert_called_once()
+
+    @patch('code_checker.tasks.pop_due_dirty_files')
+    def test_run_flake8_checker_skips_when_locked(self, mock_pop_due_dirty_files) -> None:
+        """Test a run doesn't dispatch anything while the previous run holds the lock."""
+        self.mock_lock.acquire.return_value = False
+
+        run_flake8_checker()
+
+        self.mock_lock.acquire.assert_called_once_with(blocking=False)
+        mock_pop_due_dirty_files.assert_not_called()
+        self.mock_lock.release.assert_not_called()
+
+    @override_settings(CODE_CHECKER_RUN_TIME_BUDGET=45, CODE_CHECKER_RUN_LOCK_TIMEOUT=60)
+    @patch('code_checker.tasks.time.monotonic', side_effect=[0, 10, 50])
+    @patch('code_checker.tasks.mark_files_dirty')
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files', return_value=[1, 2, 3])
+    def test_run_flake8_checker_time_budget(self, mock_pop, mock_group, mock_dispatch, mock_mark, _) -> None:
+        """Test a run stops dispatching users after the time budget and marks the rest of the chunk dirty again."""
+        mock_group.return_value = [('first@example.com', [1, 3]), ('second@example.com', [2])]
+
+        run_flake8_checker()
+
+        mock_pop.assert_called_once()
+        mock_dispatch.assert_called_once_with(user_email='first@example.com', file_ids=[1, 3])
+        mock_mark.assert_called_once_with(file_ids=[2], marked_at=mock_pop.call_args.kwargs['due_before'])
+        self.mock_lock.extend.assert_called_once_with(60, replace_ttl=True)
+        self.mock_lock.release.assert_called_once()
+
+    @patch('code_checker.tasks.mark_files_dirty')
+    @patch('code_checker.tasks.dispatch_user_checks')
+    @patch('code_checker.tasks.group_files_by_user')
+    @patch('code_checker.tasks.pop_due_dirty_files', return_value=[1, 2, 3])
+    def test_run_flake8_checker_with_lost_lock(self, mock_pop, mock_group, mock_dispatch, mock_mark) -> None:
+        """Test a run stops dispatching users when its lock was taken over and marks the rest dirty again."""
+        mock_group.return_value = [('first@example.com', [1, 3]), ('second@example.com', [2])]
+        self.mock_lock.extend.side_effect = [None, LockError]
+        self.mock_lock.release.side_effect = LockError
+
+        run_flake8_checker()
+
+        mock_pop.assert_called_once()
+        mock_dispatch.assert_called_once_with(user_email='first@example.com', file_ids=[1, 3])
+        mock_mark.assert_called_once_with(file_ids=[2], marked_at=mock_pop.call_args.kwargs['due_before'])
+
+    @override_settings(CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE=2)
+    @patch('code_checker.tasks.mark_files_dirty')
+    @patch('code_checker.tasks.get_files_with_new_or_overwritten_state')
+    def test_reconcile_dirty_files(self, mock_get_files, mock_mark_files_dirty) -> None:
+        """Test files waiting for the check in the database are streamed and marked dirty in chunks."""
+        mock_get_files.return_value.iterator.return_value = iter([4, 5, 6])
+
+        reconcile_dirty_files()
+
+        mock_get_files.return_value.iterator.assert_called_once_with(chunk_size=2)
+        assert [call.kwargs['file_ids'] for call in mock_mark_files_dirty.call_args_list] == [[4, 5], [6]]
+
+    @override_settings(CODE_CHECKER_BATCH_SIZE=2)
+    @patch('code_checker.tasks.chord')
+    def test_dispatch_user_checks(self, mock_chord) -> None:
+        """Test user files are split into batches with one notification callback."""
+        dispatch_user_checks(user_email='mrrobot@example.com', file_ids=[1, 2, 3])
+
+        header = list(mock_chord.call_args.args[0])
+        callback = mock_chord.return_value.call_args.args[0]
+
+        assert header == [check_files_batch.s(file_ids=[1, 2]), check_files_batch.s(file_ids=[3])]
+        assert callback == notify_user_about_checks.s(user_email='mrrobot@example.com')
+
+    @patch('code_checker.tasks.send_notification_email.delay')
+    def test_notify_user_about_checks(self, mock_send_notification_email) -> None:
+        """Test results of all batches are sent to the user in one email."""
+        notify_user_about_checks(
+            check_results=[[['test_file1.py'], [1]], [['test_file2.py'], [2]]],
+            user_email='mrrobot@example.com',
+        )
+
+        assert mock_send_notification_email.call_count == 1
+        assert mock_send_notification_email.call_args.kwargs['code_check_objects_id'] == [1, 2]
+        assert 'test_file1.py, test_file2.py' in mock_send_notification_email.call_args.kwargs['message']
+
+    @patch('code_checker.tasks.send_notification_email.delay')
+    def test_notify_user_about_checks_without_checked_files(self, mock_send_notification_email) -> None:
+        """Test no email is sent when the batches did not check any file."""
+        notify_user_about_checks(check_results=[[[], []]], user_email='mrrobot@example.com')
+
+        mock_send_notification_email.assert_not_called()
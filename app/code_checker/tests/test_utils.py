@@ -1,8 +1,16 @@
 import os
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
-from code_checker.utils import run_flake8
+from code_checker.isolation import IsolatedRunTimeoutError
+from code_checker.utils import (
+    CHECK_TIMEOUT_RETURN_CODE,
+    check_files_with_output_cap,
+    parse_flake8_output,
+    run_flake8,
+    run_flake8_batch,
+)
 
 
 class RunFlake8Test:
@@ -41,3 +49,62 @@ class RunFlake8Test:
         assert return_code == 1
         assert 'No such file or directory' in stdout
         assert stderr == ''
+
+
+def test_parse_flake8_output() -> None:
+    """Test parse_flake8_output utility function splits flake8 lines into components."""
+    output = (
+        "/media/user_1/code/file.py:1:1: F401 'os' imported but unused\n"
+        '/media/user_1/code/file.py:12:80: E501 line too long (81 > 79 characters)\n'
+    )
+
+    assert parse_flake8_output(output) == [
+        (1, 1, 'F401', "'os' imported but unused"),
+        (12, 80, 'E501', 'line too long (81 > 79 characters)'),
+    ]
+    assert parse_flake8_output('') == []
+
+
+@patch('code_checker.utils.run_isolated')
+def test_run_flake8_batch_with_timeout(mock_run_isolated) -> None:
+    """Test a timed out batch is checked file by file and only the slow file is reported as timed out."""
+    def run_isolated(file_paths, **kwargs):
+        if len(file_paths) > 1 or file_paths == ['slow.py']:
+            raise IsolatedRunTimeoutError('Wall-clock limit of 30 seconds is exceeded')
+        return {file_paths[0]: (0, '', '')}
+
+    mock_run_isolated.side_effect = run_isolated
+
+    assert run_flake8_batch(['fast.py', 'slow.py']) == {
+        'fast.py': (0, '', ''),
+        'slow.py': (CHECK_TIMEOUT_RETURN_CODE, '', 'Wall-clock limit of 30 seconds is exceeded'),
+    }
+
+
+def test_check_files_with_output_cap() -> None:
+    """Test flake8 output longer than the limit is cut to whole lines."""
+    output = 'file.py:1:80: E501 line too long\n' * 3
+    engine = Mock(
+        check_files=Mock(return_value={'file.py': (1, output, '')}),
+        preflight_file=Mock(return_value=None),
+    )
+
+    results = check_files_with_output_cap(engine=engine, file_paths=['file.py'], max_output_size=70)
+
+    assert results == {'file.py': (1, 'file.py:1:80: E501 line too long\n' * 2, '')}
+
+
+def test_check_files_with_output_cap_preflight() -> None:
+    """Test files broken by the preflight check are not checked in full, the rest share the same sources."""
+    broken_result = (1, 'broken.py:1:1: E999 SyntaxError: invalid syntax\n', '')
+    engine = Mock(
+        check_files=Mock(return_value={'valid.py': (0, '', '')}),
+        preflight_file=Mock(side_effect=lambda file_path, source: broken_result if file_path == 'broken.py' else None),
+    )
+
+    results = check_files_with_output_cap(engine=engine, file_paths=['broken.py', 'valid.py'], max_output_size=70)
+
+    assert results == {'broken.py': broken_result, 'valid.py': (0, '', '')}
+    engine.check_files.assert_called_once_with(file_paths=['valid.py'], sources=ANY)
+    preflight_source = engine.preflight_file.call_args.kwargs['source']
+    assert engine.check_files.call_args.kwargs['sources']['valid.py'] is preflight_source
@@ -1,16 +1,168 @@
-import subprocess  # nosec B404
+import logging
+import re
+
+from django.conf import settings
+
+from code_checker.backends import get_check_backend
+from code_checker.isolation import IsolatedProcess, IsolatedRunError, IsolatedRunTimeoutError, run_isolated
+from code_checker.sources import SourceFile
+
+logger = logging.getLogger(__name__)
+
+# A line of the checker report, shared by the violations parser and the report page showing lines without a code
+FLAKE8_OUTPUT_LINE_PATTERN = re.compile(
+    r'^(?P<path>.+?):(?P<line>\d+):(?P<column>\d+):(?:[ \t]*(?P<error_code>[A-Z]+\d+) (?P<error_text>.*))?',
+    flags=re.MULTILINE,
+)
+
+# The same return code as the `timeout` command line utility uses
+CHECK_TIMEOUT_RETURN_CODE = 124
+
+# Room for pickling the dict with results on top of the output of the files
+RESULT_SIZE_OVERHEAD = 64 * 1024
 
 
 def run_flake8(file_path):
     """Run python flake8 module for checking user file."""
+    return run_flake8_batch(file_paths=[file_path])[str(file_path)]
+
+
+def run_flake8_batch(file_paths, sources=None):
+    """
+    Run python flake8 module for checking several user files in one flake8 session.
+
+    The check runs in a child process with time and memory limits. When a batch fails, its files are checked
+    one by one, so only the file that breaks the limits fails. The child inherits the files already read in the worker
+    from `sources`, a dict with the file path as a key and its SourceFile as a value, and parses them itself.
+    """
+    file_paths = [str(file_path) for file_path in file_paths]
+
     try:
-        result = subprocess.run(
-            ['flake8', file_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )  # nosec B603, B607
-
-        return result.returncode, result.stdout, result.stderr
+        return _run_flake8_isolated(file_paths=file_paths, sources=sources)
+    except IsolatedRunError as e:
+        if len(file_paths) > 1:
+            logger.warning(f'Check of {len(file_paths)} files failed ({e}), check the files one by one')
+            return {
+                file_path: result
+                for single_file_path in file_paths
+                for file_path, result in run_flake8_batch(file_paths=[single_file_path], sources=sources).items()
+            }
+
+        return get_failed_results(file_paths=file_paths, error=e)
     except Exception as e:
-        return 1, '', str(e)
+        return get_failed_results(file_paths=file_paths, error=e)
+
+
+def start_flake8_process(file_paths, sources=None):
+    """
+    Start the flake8 check of several files in a child process without waiting for its result.
+
+    Args:
+        file_paths: Paths to the files for checking.
+        sources: A dict with the file path as a key and its SourceFile as a value, inherited by the child.
+
+    Returns:
+        A running IsolatedProcess, its result is the same dict as `run_flake8_batch` returns.
+    """
+    return IsolatedProcess(
+        **_get_flake8_process_kwargs(file_paths=[str(file_path) for file_path in file_paths], sources=sources),
+    )
+
+
+def get_failed_results(file_paths, error):
+    """
+    Create check results of files whose check failed.
+
+    Args:
+        file_paths: Paths to the files.
+        error: The exception of the check, a timeout gets the CHECK_TIMEOUT_RETURN_CODE return code.
+
+    Returns:
+        A dict with the file path as a key and a tuple with the return code, stdout and stderr as a value.
+    """
+    return_code = CHECK_TIMEOUT_RETURN_CODE if isinstance(error, IsolatedRunTimeoutError) else 1
+
+    return {file_path: (return_code, '', str(error)) for file_path in file_paths}
+
+
+def parse_flake8_output(output):
+    """Parse flake8 output into tuples with the line, column, error code and error text."""
+    return [
+        (int(match['line']), int(match['column']), match['error_code'], match['error_text'])
+        for match in FLAKE8_OUTPUT_LINE_PATTERN.finditer(output)
+        if match['error_code']
+    ]
+
+
+def check_files_with_output_cap(engine, file_paths, max_output_size, sources=None):
+    """
+    Check files with the engine and cut the output of every file to whole lines within the size limit.
+
+    Runs in the limited check process. Files that can't be read or parsed get their E902 or E999 error from
+    the preflight check of the engine, the rest of the files are checked in full with the same parsed sources.
+    """
+    file_paths = [str(file_path) for file_path in file_paths]
+    sources = {file_path: (sources or {}).get(file_path) or SourceFile(file_path) for file_path in file_paths}
+    results = _run_preflight_checks(engine=engine, file_paths=file_paths, sources=sources)
+    files_to_check = [file_path for file_path in file_paths if file_path not in results]
+
+    if files_to_check:
+        results.update(engine.check_files(file_paths=files_to_check, sources=sources))
+
+    for file_path, (return_code, stdout_, stderr_) in results.items():
+        if len(stdout_) > max_output_size:
+            logger.warning(f'Output of the check of {file_path} is cut to {max_output_size} characters')
+            results[file_path] = (return_code, stdout_[:stdout_.rfind('\n', 0, max_output_size) + 1], stderr_)
+
+    return results
+
+
+def _run_preflight_checks(engine, file_paths, sources):
+    """
+    Find files that can't be read or parsed, they don't need the full check.
+
+    Errors of the preflight itself (a file too deeply nested to parse) are only logged,
+    such files are left to the full check.
+
+    Args:
+        engine: The checker backend.
+        file_paths: Paths to the files for checking.
+        sources: A dict with the file path as a key and its SourceFile as a value, the parsed files are kept there.
+
+    Returns:
+        A dict with the path of a broken file as a key and a tuple with the return code, stdout and stderr as a value.
+    """
+    results = {}
+
+    for file_path in file_paths:
+        try:
+            result = engine.preflight_file(file_path=file_path, source=sources[file_path])
+        except Exception:
+            logger.exception(f'Preflight check of {file_path} failed')
+            continue
+
+        if result:
+            results[file_path] = result
+
+    return results
+
+
+def _run_flake8_isolated(file_paths, sources=None):
+    """Run flake8 in a child process limited by the code checker settings."""
+    return run_isolated(**_get_flake8_process_kwargs(file_paths=file_paths, sources=sources))
+
+
+def _get_flake8_process_kwargs(file_paths, sources=None):
+    """Arguments of the child process that checks the files with the checker backend of the worker."""
+    max_output_size = settings.CODE_CHECKER_MAX_OUTPUT_SIZE
+
+    return dict(
+        func=check_files_with_output_cap,
+        timeout=settings.CODE_CHECKER_TIMEOUT * len(file_paths),
+        memory_limit=settings.CODE_CHECKER_MEMORY_LIMIT,
+        max_result_size=max_output_size * len(file_paths) + RESULT_SIZE_OVERHEAD,
+        engine=get_check_backend(),
+        file_paths=file_paths,
+        max_output_size=max_output_size,
+        sources=sources,
+    )
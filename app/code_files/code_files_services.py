@@ -1,35 +1,47 @@
+import logging
+
 from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, OuterRef, Subquery, Value, When
 from django.utils import timezone
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
 
+from code_checker.dirty_files import mark_files_dirty
 from code_checker.models import CodeCheck, CodeCheckStatus
+from code_checker.tasks import dispatch_user_checks
 from code_files.models import FileState
 
+logger = logging.getLogger(__name__)
+
 
 def create_files_with_check_status(files):
     """
-    Create a list of tuples, each containing a file and its associated CodeCheck object.
+    Annotate files with the status of their latest CodeCheck in the same query.
 
     Args:
         files: A QuerySet of UploadedFile objects.
 
     Returns:
-        list: A list of tuples, where each tuple contains an UploadedFile and its associated CodeCheck.
+        QuerySet: UploadedFile objects with the `check_status` and `check_status_label` attributes.
     """
-    files_with_checks = []
+    latest_code_check = CodeCheck.objects.filter(file=OuterRef('pk')).order_by('-pk')
 
-    for file in files:
-        code_check = CodeCheck.objects.filter(file=file).first()
-        files_with_checks.append((file, code_check))
-
-    return files_with_checks
+    return files.annotate(
+        check_status=Subquery(latest_code_check.values('status')[:1]),
+        check_status_label=Case(
+            *(When(check_status=status, then=Value(label)) for status, label in CodeCheckStatus.choices),
+            output_field=CharField(),
+        ),
+    )
 
 
 def create_paginator_obj(files, page_number):
     """
-    Create a paginator object for the given list of files.
+    Create a paginator object for the given files.
 
     Args:
-        files: List of files to be paginated.
+        files: QuerySet of files to be paginated, only the requested page is loaded from the database.
         page_number: The page number to retrieve.
 
     Returns:
@@ -65,16 +77,27 @@ def add_new_file(form, user, new_file_name):
         form: The form object containing file data.
         user: The user associated with the file.
         new_file_name: Name of the new file.
+
+    Raises:
+        IntegrityError: If the user already has a file with this name.
     """
     new_file = form.save(commit=False)
     new_file.user = user
     new_file.filename = new_file_name
     new_file.state = FileState.NEW.value
 
-    new_file.save()
+    try:
+        with transaction.atomic():
+            new_file.save()
+    except IntegrityError:
+        # The file content is already stored, it isn't referenced by any row if the insert fails
+        new_file.file.delete(save=False)
+        raise
 
     CodeCheck.objects.create(file=new_file, status=CodeCheckStatus.UNCHECKED.value)
 
+    _check_file_on_commit(file_obj=new_file)
+
 
 def update_exist_file(old_file):
     """
@@ -87,7 +110,36 @@ def update_exist_file(old_file):
     old_file.uploaded_at = timezone.now()
     old_file.save()
 
-    CodeCheck.objects.filter(file=old_file).update(status=CodeCheckStatus.UNCHECKED.value)
+    CodeCheck.objects.filter(file=old_file).update(
+        status=CodeCheckStatus.UNCHECKED.value,
+        attempts=0,
+        next_attempt_at=None,
+    )
+
+    _check_file_on_commit(file_obj=old_file)
+
+
+def _check_file_on_commit(file_obj):
+    """
+    Start the code check of the file right after the upload is committed, without waiting for the beat schedule.
+
+    The file is also marked dirty, so the beat task checks it if this check is lost or the broker can't be reached.
+
+    Args:
+        file_obj: The uploaded file object.
+    """
+    user_email = file_obj.user.email
+    file_id = file_obj.id
+
+    def check_file():
+        mark_files_dirty(file_ids=[file_id])
+
+        try:
+            dispatch_user_checks(user_email=user_email, file_ids=[file_id])
+        except (OperationalError, RedisError):
+            logger.exception(f'Check of the uploaded file {file_id} is not dispatched, it is left to the beat task')
+
+    transaction.on_commit(check_file)
 
 
 def delete_file(model, file_pk, user):
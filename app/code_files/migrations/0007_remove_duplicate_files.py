@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:02
+
+import logging
+
+from django.db import migrations, transaction
+from django.db.models import Count, Min
+
+logger = logging.getLogger(__name__)
+
+
+def remove_duplicate_files(apps, schema_editor):
+    """
+    Keep only the earliest row for every (user, filename) pair, the upload path always updated that one.
+
+    The rows are deleted in this data-only migration, the unique constraint is added by the next one, because
+    PostgreSQL can't create an index on a table with pending trigger events of the deleted rows. The stored files
+    of the deleted rows are removed after the migration is committed.
+    """
+    UploadedFile = apps.get_model('code_files', 'UploadedFile')
+    db_alias = schema_editor.connection.alias
+
+    duplicates = (
+        UploadedFile.objects.using(db_alias)
+        .exclude(filename='')
+        .values('user', 'filename')
+        .annotate(files_count=Count('pk'), first_pk=Min('pk'))
+        .filter(files_count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        duplicate_files = list(
+            UploadedFile.objects.using(db_alias)
+            .filter(user=duplicate['user'], filename=duplicate['filename'])
+            .exclude(pk=duplicate['first_pk']),
+        )
+
+        for file_obj in duplicate_files:
+            logger.warning(
+                f'Remove duplicate file {file_obj.pk} {file_obj.filename!r} of user {file_obj.user_id}, '
+                f'stored as {file_obj.file.name}',
+            )
+            file_obj.delete()
+            transaction.on_commit(lambda stored_file=file_obj.file: stored_file.delete(save=False), using=db_alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_files', '0006_alter_uploadedfile_options_alter_uploadedfile_file_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_files, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_files', '0007_remove_duplicate_files'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['user', '-uploaded_at'], name='uploadedfile_user_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(condition=models.Q(('state__in', ['New', 'Overwritten'])), fields=['uploaded_at'], name='uploadedfile_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='uploadedfile',
+            constraint=models.UniqueConstraint(condition=models.Q(('filename', ''), _negated=True), fields=('user', 'filename'), name='uploadedfile_user_filename_uniq'),
+        ),
+    ]
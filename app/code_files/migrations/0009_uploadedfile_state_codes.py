@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:03
+
+from django.db import migrations
+
+# Rows were written with both enum names (the old field default) and enum values.
+STATE_CODES = {
+    1: ('NEW', 'New'),
+    2: ('OVERWRITTEN', 'Overwritten'),
+    3: ('OLD', 'Old'),
+}
+
+
+def state_strings_to_codes(apps, schema_editor):
+    """Replace state names and values with integer codes while the column is still a string."""
+    UploadedFile = apps.get_model('code_files', 'UploadedFile')
+
+    for code, state_strings in STATE_CODES.items():
+        UploadedFile.objects.filter(state__in=state_strings).update(state=str(code))
+
+    UploadedFile.objects.exclude(state__in=[str(code) for code in STATE_CODES]).update(state='1')
+
+
+def state_codes_to_strings(apps, schema_editor):
+    """Replace integer codes with state values after the column is a string again."""
+    UploadedFile = apps.get_model('code_files', 'UploadedFile')
+
+    for code, state_strings in STATE_CODES.items():
+        UploadedFile.objects.filter(state=str(code)).update(state=state_strings[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_files', '0008_uploadedfile_indexes_and_unique_filename'),
+    ]
+
+    operations = [
+        migrations.RunPython(state_strings_to_codes, reverse_code=state_codes_to_strings),
+    ]
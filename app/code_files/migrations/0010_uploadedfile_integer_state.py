@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_files', '0009_uploadedfile_state_codes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='uploadedfile',
+            name='uploadedfile_pending_idx',
+        ),
+        migrations.AlterField(
+            model_name='uploadedfile',
+            name='state',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'New'), (2, 'Overwritten'), (3, 'Old')], default=1, verbose_name='File state'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(condition=models.Q(('state__in', [1, 2])), fields=['uploaded_at'], name='uploadedfile_pending_idx'),
+        ),
+    ]
@@ -1,5 +1,3 @@
-from enum import Enum
-
 from django.db import models
 
 from users.models import User
@@ -10,12 +8,12 @@ def user_directory_path(instance, filename):
     return f'user_{instance.user.id}/code/{filename}'
 
 
-class FileState(Enum):
+class FileState(models.IntegerChoices):
     """Enum file states."""
 
-    NEW = 'New'
-    OVERWRITTEN = 'Overwritten'
-    OLD = 'Old'
+    NEW = 1, 'New'
+    OVERWRITTEN = 2, 'Overwritten'
+    OLD = 3, 'Old'
 
 
 class UploadedFile(models.Model):
@@ -34,11 +32,10 @@ class UploadedFile(models.Model):
         verbose_name='Filename',
         max_length=80,
     )
-    state = models.CharField(
+    state = models.PositiveSmallIntegerField(
         verbose_name='File state',
-        max_length=11,
-        choices=[(state_.name, state_.value) for state_ in FileState],
-        default=FileState.NEW.value,
+        choices=FileState.choices,
+        default=FileState.NEW,
     )
     uploaded_at = models.DateTimeField(
         verbose_name='Uploaded At',
@@ -48,6 +45,21 @@ class UploadedFile(models.Model):
     class Meta:
         verbose_name = 'Uploaded File'
         verbose_name_plural = 'Uploaded Files'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'filename'],
+                condition=~models.Q(filename=''),
+                name='uploadedfile_user_filename_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-uploaded_at'], name='uploadedfile_user_uploaded_idx'),
+            models.Index(
+                fields=['uploaded_at'],
+                condition=models.Q(state__in=[FileState.NEW.value, FileState.OVERWRITTEN.value]),
+                name='uploadedfile_pending_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.file.name
@@ -1,4 +1,5 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
 from pytest_django.asserts import TestCase
 
 from code_files.models import FileState, UploadedFile
@@ -62,3 +63,11 @@ class TestUploadedFile(TestCase):
         self.uploaded_file.save()
 
         assert self.uploaded_file.state == FileState.OLD.value
+
+    def test_filename_is_unique_per_user(self) -> None:
+        """Test that a user can't have two files with the same filename."""
+        self.uploaded_file.filename = 'test_file4.py'
+        self.uploaded_file.save()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UploadedFile.objects.create(user=self.user_instance, filename='test_file4.py')
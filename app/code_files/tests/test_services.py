@@ -1,7 +1,9 @@
 from datetime import datetime
+from unittest.mock import patch
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from kombu.exceptions import OperationalError
 
 from code_checker.models import CodeCheck, CodeCheckStatus
 from code_files.code_files_services import (
@@ -50,6 +52,47 @@ class TestCodeFilesServices(TestCase):
 
         file_obj.file.delete()
 
+    @patch('code_files.code_files_services.mark_files_dirty')
+    @patch('code_files.code_files_services.dispatch_user_checks')
+    def test_add_new_file_starts_check_on_commit(self, mock_dispatch_user_checks, mock_mark_files_dirty) -> None:
+        """Test adding a new file starts its code check after the transaction is committed."""
+        form = FileUploadForm(data={}, files={'file': self.uploaded_file})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            add_new_file(form=form, user=self.user, new_file_name='new_file.py')
+
+            mock_dispatch_user_checks.assert_not_called()
+
+        file_obj = UploadedFile.objects.get(user=self.user, filename='new_file.py')
+        mock_dispatch_user_checks.assert_called_once_with(user_email=self.user.email, file_ids=[file_obj.id])
+        mock_mark_files_dirty.assert_called_once_with(file_ids=[file_obj.id])
+
+        file_obj.file.delete()
+
+    @patch('code_files.code_files_services.mark_files_dirty')
+    @patch('code_files.code_files_services.dispatch_user_checks')
+    def test_update_exist_file_starts_check_on_commit(self, mock_dispatch_user_checks, mock_mark_files_dirty) -> None:
+        """Test updating an existing file starts its code check after the transaction is committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            update_exist_file(old_file=self.create_file_object)
+
+        mock_dispatch_user_checks.assert_called_once_with(
+            user_email=self.user.email,
+            file_ids=[self.create_file_object.id],
+        )
+        mock_mark_files_dirty.assert_called_once_with(file_ids=[self.create_file_object.id])
+
+    @patch('code_files.code_files_services.mark_files_dirty')
+    @patch('code_files.code_files_services.dispatch_user_checks')
+    def test_check_on_commit_broker_error(self, mock_dispatch_user_checks, mock_mark_files_dirty) -> None:
+        """Test the upload doesn't fail if the check can't be dispatched, the file is still marked dirty."""
+        mock_dispatch_user_checks.side_effect = OperationalError('Error 111 connecting to redis:6379')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_exist_file(old_file=self.create_file_object)
+
+        mock_mark_files_dirty.assert_called_once_with(file_ids=[self.create_file_object.id])
+
     def test_update_exist_file(self) -> None:
         """Test updating an existing file using the update_exist_file service."""
         old_file = self.create_file_object
@@ -119,14 +162,18 @@ class TestCodeFilesServices(TestCase):
         CodeCheck.objects.create(file=file_obj_2, status=CodeCheckStatus.UNCHECKED.value)
 
         files = UploadedFile.objects.filter(user=self.user).order_by('-uploaded_at', '-state')
-        files_with_checks = create_files_with_check_status(files=files)
-
-        print(f'TTTSSTS {files_with_checks[:2]}')
 
-        for file_, code_check_ in files_with_checks[:2]:
-            assert isinstance(file_, UploadedFile)
-            assert isinstance(code_check_, CodeCheck)
-            assert code_check_.status in (CodeCheckStatus.UNCHECKED.value, CodeCheckStatus.DONE.value)
+        with self.assertNumQueries(1):
+            files_with_checks = {
+                file_.pk: (file_.check_status, file_.check_status_label)
+                for file_ in create_files_with_check_status(files=files)
+            }
+
+        assert files_with_checks == {
+            self.create_file_object.pk: (None, None),
+            file_obj_1.pk: (CodeCheckStatus.DONE.value, 'Done'),
+            file_obj_2.pk: (CodeCheckStatus.UNCHECKED.value, 'Unchecked'),
+        }
 
         file_obj_1.file.delete()
         file_obj_2.file.delete()
@@ -1,4 +1,5 @@
 import tempfile
+from unittest.mock import patch
 
 import pytest
 from django.core.exceptions import ObjectDoesNotExist
@@ -6,7 +7,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase
 from django.urls import reverse
 
-from code_files.models import UploadedFile
+from code_files.models import FileState, UploadedFile
 from users.models import User
 
 
@@ -69,6 +70,29 @@ class TestFileManagementView(BaseSetUp):
 
         file_.file.delete()
 
+    def test_post_upload_same_name_concurrently(self) -> None:
+        """Test an upload that loses the race with another upload of the same name overwrites that file."""
+        url = reverse('code_files:file_list')
+        self.client.login(email='mrrobot2@example.com', password='testpassword')
+        existing_file = UploadedFile.objects.create(
+            user=self.user,
+            file=SimpleUploadedFile('race.py', b'x = 1\n'),
+            filename='race.py',
+            state=FileState.NEW.value,
+        )
+
+        # The other upload creates the file after this request has looked for it
+        with patch('code_files.views.return_old_file_name_if_file_exist', return_value=None):
+            response = self.client.post(url, {'file': SimpleUploadedFile('race.py', b'x = 2\n')})
+
+        existing_file.refresh_from_db()
+
+        assert response.status_code == 302
+        assert UploadedFile.objects.filter(user=self.user, filename='race.py').count() == 1
+        assert existing_file.state == FileState.OVERWRITTEN.value
+
+        existing_file.file.delete()
+
     def test_post_upload_invalid_file_format(self) -> None:
         """Test uploading a file with an invalid format using the POST request to the file management view."""
         url = reverse('code_files:file_list')
@@ -1,4 +1,5 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
 from django.shortcuts import redirect, render
 from django.views import View
 
@@ -56,7 +57,12 @@ class FileManagementView(LoginRequiredMixin, TitleMixin, View):
             if old_file_name:
                 update_exist_file(old_file=old_file_name)
             else:
-                add_new_file(form=form, user=request.user, new_file_name=file_name)
+                try:
+                    with transaction.atomic():
+                        add_new_file(form=form, user=request.user, new_file_name=file_name)
+                except IntegrityError:
+                    # A concurrent upload of the same name created the file first, this upload overwrites it
+                    update_exist_file(old_file=UploadedFile.objects.get(user=owner_id, filename=file_name))
 
             return redirect('code_files:file_list')
         else:
@@ -19,4 +19,8 @@ app.conf.beat_schedule = {
         'task': 'Run flake8 checker',
         'schedule': crontab(minute=settings.CELERY_SCHEDULE_TIME_MINUTES),  # TODO: change for real schedule time
     },
+    'reconcile-dirty-files': {
+        'task': 'Reconcile dirty files',
+        'schedule': crontab(minute=settings.CELERY_RECONCILE_SCHEDULE_TIME_MINUTES),
+    },
 }
@@ -1,9 +1,29 @@
 from config.settings.base import *  # noqa: F401, F403
 from config.settings.celery import (  # noqa: F401, F403
     CELERY_BROKER_URL,
+    CELERY_RECONCILE_SCHEDULE_TIME_MINUTES,
     CELERY_RESULT_BACKEND,
     CELERY_SCHEDULE_TIME_MINUTES,
 )
+from config.settings.code_checker import (  # noqa: F401, F403
+    CODE_CHECKER_BACKEND,
+    CODE_CHECKER_BATCH_SIZE,
+    CODE_CHECKER_CACHE_TIMEOUT,
+    CODE_CHECKER_DAEMON_MAX_FILES,
+    CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE,
+    CODE_CHECKER_EXECUTOR,
+    CODE_CHECKER_EXECUTOR_WORKERS,
+    CODE_CHECKER_LEASE_TIMEOUT,
+    CODE_CHECKER_MAX_ATTEMPTS,
+    CODE_CHECKER_MAX_FILES_PER_RUN,
+    CODE_CHECKER_MAX_OUTPUT_SIZE,
+    CODE_CHECKER_MEMORY_LIMIT,
+    CODE_CHECKER_RETRY_DELAY,
+    CODE_CHECKER_RUN_LOCK_TIMEOUT,
+    CODE_CHECKER_RUN_TIME_BUDGET,
+    CODE_CHECKER_SWEEP_DELAY,
+    CODE_CHECKER_TIMEOUT,
+)
 from config.settings.database import DATABASES  # noqa: F401, F403
 from config.settings.email import *  # noqa: F401, F403
 from config.settings.logging import LOGGING  # noqa: F401, F403
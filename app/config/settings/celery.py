@@ -1,4 +1,4 @@
-from os import environ
+from os import environ, getenv
 
 REDIS_HOST = environ['REDIS_HOST']
 REDIS_PORT = environ['REDIS_PORT']
@@ -6,3 +6,6 @@ REDIS_PORT = environ['REDIS_PORT']
 CELERY_BROKER_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 CELERY_RESULT_BACKEND = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 CELERY_SCHEDULE_TIME_MINUTES = environ['CELERY_SCHEDULE_TIME_MINUTES']
+
+# Minutes of the crontab for looking up files missed in the dirty files set (0 - every hour)
+CELERY_RECONCILE_SCHEDULE_TIME_MINUTES = getenv('CELERY_RECONCILE_SCHEDULE_TIME_MINUTES') or '0'
@@ -0,0 +1,65 @@
+from os import getenv
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Tool checking the files: "flake8" - flake8 with all plugins in the worker, "flake8_subprocess" - the flake8 command
+# line, "pycodestyle_pyflakes" - pycodestyle and pyflakes directly, "ruff" - the ruff binary if it is installed
+CODE_CHECKER_BACKEND = getenv('CODE_CHECKER_BACKEND') or 'flake8'
+
+# Lifetime of flake8 results cached by the file content, in seconds
+CODE_CHECKER_CACHE_TIMEOUT = int(getenv('CODE_CHECKER_CACHE_TIMEOUT') or 60 * 60 * 24 * 7)
+
+# Number of files checked by one Celery task, every batch runs in a single flake8 session
+CODE_CHECKER_BATCH_SIZE = int(getenv('CODE_CHECKER_BATCH_SIZE') or 10)
+
+# Seconds after which a check left in checking by a lost worker can be claimed by another worker
+CODE_CHECKER_LEASE_TIMEOUT = int(getenv('CODE_CHECKER_LEASE_TIMEOUT') or 60 * 10)
+
+# Files are checked right after the upload, the beat sweeper only takes files uploaded earlier than this, in seconds
+CODE_CHECKER_SWEEP_DELAY = int(getenv('CODE_CHECKER_SWEEP_DELAY') or 60)
+
+# Number of file ids taken from the dirty files set or read from the database at once by the beat tasks
+CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE = int(getenv('CODE_CHECKER_DIRTY_FILES_CHUNK_SIZE') or 500)
+
+# Maximum number of files dispatched by one beat run, the rest are left for the next run
+CODE_CHECKER_MAX_FILES_PER_RUN = int(getenv('CODE_CHECKER_MAX_FILES_PER_RUN') or 5000)
+
+# Seconds one beat run keeps dispatching files, the rest are left for the next run
+CODE_CHECKER_RUN_TIME_BUDGET = int(getenv('CODE_CHECKER_RUN_TIME_BUDGET') or 45)
+
+# Seconds the lock of a beat run lives without renewal, it's renewed after every dispatched user
+CODE_CHECKER_RUN_LOCK_TIMEOUT = int(getenv('CODE_CHECKER_RUN_LOCK_TIMEOUT') or 60)
+
+# Number of failed attempts after which the check of a file is quarantined until the file is uploaded again
+CODE_CHECKER_MAX_ATTEMPTS = int(getenv('CODE_CHECKER_MAX_ATTEMPTS') or 5)
+
+# Seconds before the first retry of a failed check, the delay is doubled after every next fail
+CODE_CHECKER_RETRY_DELAY = int(getenv('CODE_CHECKER_RETRY_DELAY') or 60)
+
+# Wall-clock and CPU time limit of the check of one file in seconds, a batch gets the sum of its files limits
+CODE_CHECKER_TIMEOUT = int(getenv('CODE_CHECKER_TIMEOUT') or 30)
+
+# Bytes of memory the check process may allocate on top of the worker, 0 - no limit
+CODE_CHECKER_MEMORY_LIMIT = int(getenv('CODE_CHECKER_MEMORY_LIMIT') or 512 * 1024 * 1024)
+
+# Maximum size of the saved flake8 output of one file in characters, the rest of the output is dropped
+CODE_CHECKER_MAX_OUTPUT_SIZE = int(getenv('CODE_CHECKER_MAX_OUTPUT_SIZE') or 1024 * 1024)
+
+# How the files of one task are checked: "process_pool" - in parallel child processes, "sequential" - one by one,
+# "subprocess" - in parallel flake8 command line subprocesses, only with the flake8 backends,
+# "daemon_pool" - in parallel long-lived check processes
+CODE_CHECKER_EXECUTOR = getenv('CODE_CHECKER_EXECUTOR') or 'process_pool'
+
+# The subprocess executor always runs the flake8 command line, its output is cached as the result of the backend
+if CODE_CHECKER_EXECUTOR == 'subprocess' and CODE_CHECKER_BACKEND not in {'flake8', 'flake8_subprocess'}:
+    raise ImproperlyConfigured(
+        f'CODE_CHECKER_EXECUTOR=subprocess runs flake8 and works only with the flake8 backends, '
+        f'not with CODE_CHECKER_BACKEND={CODE_CHECKER_BACKEND}',
+    )
+
+# Number of processes checking the files of one task at the same time. Every prefork Celery worker process has
+# its own pool, so a host runs up to the worker concurrency times this many checks, each within the memory limit
+CODE_CHECKER_EXECUTOR_WORKERS = max(int(getenv('CODE_CHECKER_EXECUTOR_WORKERS') or 2), 1)
+
+# Number of files after which a check daemon is restarted to free the memory it has grown
+CODE_CHECKER_DAEMON_MAX_FILES = int(getenv('CODE_CHECKER_DAEMON_MAX_FILES') or 500)
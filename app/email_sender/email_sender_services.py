@@ -1,16 +1,35 @@
 import logging
 
+from django.db import transaction
+
 from code_checker.models import CheckLog, CodeCheck
 
 logger = logging.getLogger(__name__)
 
 
 def add_info_about_email_send_to_log(email, code_check_objects_id):
-    for code_check_id in code_check_objects_id:
-        code_check = CodeCheck.objects.get(pk=code_check_id)
+    """
+    Mark code checks as notified and add information about the sent email to their logs.
+
+    Args:
+        email: Email the notification was sent to.
+        code_check_objects_id: List of IDs of code check objects.
+
+    Raises:
+        CodeCheck.DoesNotExist: If any of the code checks does not exist.
+    """
+    code_checks = CodeCheck.objects.filter(pk__in=code_check_objects_id)
+
+    with transaction.atomic():
+        existing_ids = list(code_checks.select_for_update().values_list('pk', flat=True))
+
+        if len(existing_ids) != len(set(code_check_objects_id)):
+            missing_ids = set(code_check_objects_id) - set(existing_ids)
+            raise CodeCheck.DoesNotExist(f'CodeCheck matching query does not exist: {missing_ids}')
 
-        code_check.is_notified = True
-        code_check.save()
+        code_checks.update(is_notified=True)
+        CheckLog.objects.bulk_create(
+            CheckLog(code_check_id=code_check_id, log_text=f'Send email for {email}') for code_check_id in existing_ids
+        )
 
-        CheckLog.objects.create(code_check=code_check, log_text=f'Send email for {email}')
-        logger.info('Add information to CheckLog about email send.')
+    logger.info('Add information to CheckLog about email send.')
@@ -41,6 +41,19 @@ class AddInfoAboutEmailSendToLogTest(TestCase):
         check_log = CheckLog.objects.get(code_check=self.code_check)
         assert check_log.log_text == 'Send email for mrrobot@example.com'
 
+    def test_add_info_about_email_send_to_log_for_several_checks(self) -> None:
+        """Test all code checks are marked as notified with a constant number of queries."""
+        second_code_check = CodeCheck.objects.create(file=self.uploaded_file)
+
+        with self.assertNumQueries(5):
+            add_info_about_email_send_to_log(
+                email='mrrobot@example.com',
+                code_check_objects_id=[self.code_check.id, second_code_check.id],
+            )
+
+        assert CodeCheck.objects.filter(is_notified=True).count() == 2
+        assert CheckLog.objects.filter(log_text='Send email for mrrobot@example.com').count() == 2
+
     def test_code_check_not_found(self) -> None:
         """Test handling the case when CodeCheck is not found."""
         with pytest.raises(ObjectDoesNotExist):
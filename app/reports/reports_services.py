@@ -1,13 +1,62 @@
 import logging
+import os
 import re
+from array import array
 from collections import namedtuple
+from collections.abc import Sequence
 
 from django.core.paginator import Paginator
 
-from code_checker.models import CheckLog
+from code_checker.models import CheckLog, CodeCheck
+from code_checker.utils import FLAKE8_OUTPUT_LINE_PATTERN
 
 logger = logging.getLogger(__name__)
 
+# namedtuple classes have empty __slots__, so one class shared by all rows keeps every row a plain tuple
+FileReport = namedtuple('FileReport', 'location, error_code, error_text')
+EMPTY_FILE_REPORT = FileReport(location='', error_code='', error_text='')
+
+NEW_LINE_PATTERN = re.compile(r'\n')
+
+
+class LazyResultReport(Sequence):
+    """
+    Read-only sequence of FileReport rows over the raw flake8 output.
+
+    Only the start offsets of the lines are calculated up front, a row is parsed when it's accessed,
+    so a paginator slice parses just the rows of the requested page.
+    """
+
+    def __init__(self, row_result):
+        self._row_result = row_result.strip()
+        self._line_starts = array('Q', [0])
+        self._line_starts.extend(match.end() for match in NEW_LINE_PATTERN.finditer(self._row_result))
+
+    def __len__(self):
+        return len(self._line_starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[line_index] for line_index in range(*index.indices(len(self)))]
+
+        return _parse_result_line(line=self._get_line(index=index))
+
+    def _get_line(self, index):
+        """
+        Cut a single line out of the raw output by its index.
+
+        Args:
+            index: Index of the line, negative indexes are counted from the end.
+
+        Returns:
+            The line without the trailing new line.
+        """
+        start = self._line_starts[index]
+        index %= len(self)
+        end = self._line_starts[index + 1] - 1 if index + 1 < len(self) else len(self._row_result)
+
+        return self._row_result[start:end]
+
 
 def create_paginator(request, page_count, obj, prefix):
     """
@@ -44,6 +93,19 @@ def generate_context(file_obj, report, result_info, logs_info):
     return dict(file_obj=file_obj, report=report, result_info=result_info, logs_info=logs_info)
 
 
+def get_latest_code_checks(file_obj):
+    """
+    Get only the latest CodeCheck of the file, the report page doesn't show the older ones.
+
+    Args:
+        file_obj: The UploadedFile object.
+
+    Returns:
+        A QuerySet with at most one CodeCheck.
+    """
+    return CodeCheck.objects.filter(file=file_obj).order_by('-pk')[:1]
+
+
 def generate_report_info(code_checks):
     """
     Generate a report information list from a list of CodeCheck.
@@ -53,19 +115,24 @@ def generate_report_info(code_checks):
 
     Returns:
         A list of dictionaries containing check date, status, notification status, result report, and related logs.
+        Results and logs are left as lazy sequences, so a paginator loads only the requested page.
     """
     report = []
 
     for check in code_checks:
-        reports_data = _generate_result_report(row_result=check.last_check_result)
+        reports_data = check.checkviolation_set.order_by('pk')
+
+        if not reports_data.exists():
+            # Checks without saved violations are either clean or were done before violations were stored
+            reports_data = _generate_result_report(row_result=check.last_check_result)
 
         report.append(
             {
                 'check_date': check.timestamp,
-                'status': check.status,
+                'status': check.get_status_display(),
                 'is_notified': check.is_notified,
                 'results': reports_data,
-                'logs': CheckLog.objects.filter(code_check=check).order_by('-created_at'),
+                'logs': CheckLog.objects.filter(code_check=check).order_by('-created_at', '-pk'),
             },
         )
 
@@ -80,82 +147,31 @@ def _generate_result_report(row_result):
         row_result: The row result string to generate a report from.
 
     Returns:
-        A list of namedtuples containing location, error code, and error text.
-    """
-    if row_result == 'Without problems':
-        return [_create_file_report(location='-', error_code='-', error_text='Without problems')]
-
-    pattern = re.compile(r'^\/home\/unprivilegeduser\/code\/app\/media\/user_\d+\/code\/', flags=re.MULTILINE)
-    location_match_pattern = re.compile(r'^([^:]+:\d+:\d+):')
-    error_code_match_pattern = re.compile(r'^.*:\d+:\d+:\s*([A-Z]\d+)\s')
-    error_text_match_pattern = re.compile(r'^.*:\d+:\d+:\s*[A-Z]\d+\s(.+)')
-
-    result = pattern.sub('', row_result)
-    lines = _parse_row_result(result)
-
-    report_result = []
-
-    for line in lines:
-        location, error_code, error_text = _extract_error_components(
-            line=line,
-            location_regex=location_match_pattern,
-            error_code_regex=error_code_match_pattern,
-            error_text_regex=error_text_match_pattern,
-        )
-
-        report = _create_file_report(location=location, error_code=error_code, error_text=error_text)
-        report_result.append(report)
-
-    return report_result
-
-
-def _create_file_report(location, error_code, error_text):
+        A sequence of FileReport containing location, error code, and error text.
     """
-    Create a named tuple representing a file report.
+    if row_result == CodeCheck.WITHOUT_PROBLEMS:
+        return [FileReport(location='-', error_code='-', error_text=CodeCheck.WITHOUT_PROBLEMS)]
 
-    Args:
-        location: Location of the error.
-        error_code: Error code.
-        error_text: Error text.
-
-    Returns:
-        A named tuple representing a file report.
-    """
-    return namedtuple('FileReport', 'location, error_code, error_text')(location, error_code, error_text)
-
-
-def _parse_row_result(row_result):
-    """
-    Parse a row result string into lines.
-
-    Args:
-        row_result: The row result string to parse.
-
-    Returns:
-        A list of lines from the row result.
-    """
-    return row_result.strip().split('\n')
+    return LazyResultReport(row_result=row_result)
 
 
-def _extract_error_components(line, location_regex, error_code_regex, error_text_regex):
+def _parse_result_line(line):
     """
-    Extract error components from a line.
+    Extract error components from a line in one regex pass.
 
     Args:
         line: The line to extract error components from.
-        location_regex: Regex pattern for location.
-        error_code_regex: Regex pattern for error code.
-        error_text_regex: Regex pattern for error text.
 
     Returns:
-        A tuple containing location, error code, and error text extracted from the line.
+        A FileReport with location, error code, and error text, missing components are empty strings.
     """
-    location_match = location_regex.match(line)
-    error_code_match = error_code_regex.match(line)
-    error_text_match = error_text_regex.match(line)
+    match = FLAKE8_OUTPUT_LINE_PATTERN.match(line)
 
-    location = location_match.group(1) if location_match else ''
-    error_code = error_code_match.group(1) if error_code_match else ''
-    error_text = error_text_match.group(1) if error_text_match else ''
+    if match is None:
+        return EMPTY_FILE_REPORT
 
-    return location, error_code, error_text
+    return FileReport(
+        location=f"{os.path.basename(match['path'])}:{match['line']}:{match['column']}",
+        error_code=match['error_code'] or '',
+        error_text=match['error_text'] or '',
+    )
@@ -1,13 +1,13 @@
-import re
 from unittest.mock import Mock, patch
 
 import pytest
 from django.core.paginator import Paginator
 
 from reports.reports_services import (
-    _extract_error_components,
+    FileReport,
+    LazyResultReport,
     _generate_result_report,
-    _parse_row_result,
+    _parse_result_line,
     create_paginator,
     generate_context,
     generate_report_info,
@@ -18,9 +18,10 @@ from reports.reports_services import (
 def mock_code_check():
     mock_check = Mock()
     mock_check.timestamp = '2023-08-21 12:00:00'
-    mock_check.status = 'Passed'
+    mock_check.get_status_display.return_value = 'Done'
     mock_check.is_notified = True
     mock_check.last_check_result = 'Without problems'
+    mock_check.checkviolation_set.order_by.return_value.exists.return_value = False
     return mock_check
 
 
@@ -44,7 +45,7 @@ class ReportServicesTest:
 
         assert len(report) == 1
         assert report[0]['check_date'] == mock_code_check.timestamp
-        assert report[0]['status'] == mock_code_check.status
+        assert report[0]['status'] == 'Done'
         assert report[0]['is_notified'] == mock_code_check.is_notified
         assert report[0]['results'][0].error_text == 'Without problems'
         assert report[0]['logs'][0] == mock_check_log
@@ -58,34 +59,61 @@ class ReportServicesTest:
         assert len(report) == 1
         assert report[0].error_text == 'Without problems'
 
-    def test_parse_row_result(self) -> None:
-        """Test parsing a row result into lines."""
-        row = 'Line 1\nLine 2\nLine 3'
+    def test_lazy_result_report(self) -> None:
+        """Test indexing and slicing rows of the raw flake8 output."""
+        row = 'file.py:1:1: E123 first\nfile.py:2:1: E123 second\nfile.py:3:1: E123 third\n'
+
+        report = LazyResultReport(row_result=row)
+
+        assert len(report) == 3
+        assert report[0].error_text == 'first'
+        assert report[-1].error_text == 'third'
+        assert [row_.location for row_ in report[1:]] == ['file.py:2:1', 'file.py:3:1']
+
+        with pytest.raises(IndexError):
+            report[3]
+
+    def test_lazy_result_report_parses_only_requested_page(self) -> None:
+        """Test that paginating the result report parses only the rows of the requested page."""
+        row = '\n'.join(f'file.py:{line}:80: E501 line too long' for line in range(1, 10001))
+
+        with patch('reports.reports_services._parse_result_line', wraps=_parse_result_line) as parse_mock:
+            page = Paginator(LazyResultReport(row_result=row), 5).page(1000)
+            rows = list(page)
+
+        assert page.paginator.count == 10000
+        assert [row_.location for row_ in rows] == [f'file.py:{line}:80' for line in range(4996, 5001)]
+        assert parse_mock.call_count == 5
+
+    @pytest.mark.parametrize(
+        'line, expected_report',
+        [
+            ('file.py:10:5: E123 some error text', ('file.py:10:5', 'E123', 'some error text')),
+            (
+                '/home/unprivilegeduser/code/app/media/user_1/code/file.py:1:1: F401 unused import',
+                ('file.py:1:1', 'F401', 'unused import'),
+            ),
+            ('file.py:3:1: PLR0913 too many arguments', ('file.py:3:1', 'PLR0913', 'too many arguments')),
+            ('file.py:10:5:', ('file.py:10:5', '', '')),
+            ('not a flake8 line', ('', '', '')),
+        ],
+    )
+    def test_parse_result_line(self, line, expected_report) -> None:
+        """Test extracting error components from a line."""
+        report = _parse_result_line(line=line)
 
-        lines = _parse_row_result(row_result=row)
+        assert isinstance(report, FileReport)
+        assert report == expected_report
 
-        assert len(lines) == 3
-        assert lines[0] == 'Line 1'
-        assert lines[1] == 'Line 2'
-        assert lines[2] == 'Line 3'
+    def test_generate_result_report_rows_share_one_class(self) -> None:
+        """Test that result rows are instances of one slotted class, not a new class per line."""
+        row = 'file.py:1:1: E123 first error\nfile.py:2:1: W291 trailing whitespace'
 
-    def test_extract_error_components(self) -> None:
-        """Test extracting error components from a line."""
-        line = 'file.py:10:5: E123 some error text'
-        location_match_pattern = re.compile(r'^([^:]+:\d+:\d+):')
-        error_code_match_pattern = re.compile(r'^.*:\d+:\d+:\s*([A-Z]\d+)\s')
-        error_text_match_pattern = re.compile(r'^.*:\d+:\d+:\s*[A-Z]\d+\s(.+)')
-
-        location, error_code, error_text = _extract_error_components(
-            line=line,
-            location_regex=location_match_pattern,
-            error_code_regex=error_code_match_pattern,
-            error_text_regex=error_text_match_pattern,
-        )
+        report = _generate_result_report(row_result=row)
 
-        assert location == 'file.py:10:5'
-        assert error_code == 'E123'
-        assert error_text == 'some error text'
+        assert [type(row_) for row_ in report] == [FileReport, FileReport]
+        assert not hasattr(report[0], '__dict__')
+        assert report[1] == ('file.py:2:1', 'W291', 'trailing whitespace')
 
     def test_create_paginator(self) -> None:
         """Test creating a paginator for an object."""
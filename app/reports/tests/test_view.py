@@ -1,8 +1,10 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from code_checker.models import CodeCheck, CodeCheckStatus
+from code_checker.models import CheckLog, CheckViolation, CodeCheck, CodeCheckStatus
 from code_files.models import UploadedFile
 from users.models import User
 
@@ -71,3 +73,50 @@ class TestFileReportView(TestCase):
         assert len(report) == 1
         assert len(result_info) == 1
         assert len(logs_info) == 0
+
+    def test_report_with_check_violations(self) -> None:
+        """Test that the report shows saved check violations."""
+        CheckViolation.objects.bulk_create(
+            CheckViolation(
+                code_check=self.code_check,
+                filename='test_file.py',
+                line=line,
+                column=1,
+                error_code='W291',
+                error_text='trailing whitespace',
+            )
+            for line in range(1, 8)
+        )
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('reports:file_report', kwargs={'file_id': self.uploaded_file.pk}))
+
+        result_info = response.context['result_info']
+
+        assert response.status_code == 200
+        assert result_info.paginator.count == 7
+        assert [result.location for result in result_info] == [f'test_file.py:{line}:1' for line in range(1, 6)]
+
+    def test_report_shows_only_latest_check(self) -> None:
+        """Test that the report shows the latest check and its query count doesn't depend on the check history."""
+        self.client.force_login(self.user)
+        url = reverse('reports:file_report', kwargs={'file_id': self.uploaded_file.pk})
+        CheckLog.objects.create(code_check=self.code_check, log_text='Checked')
+
+        with CaptureQueriesContext(connection) as single_check_queries:
+            self.client.get(url)
+
+        for _ in range(10):
+            code_check = CodeCheck.objects.create(
+                file=self.uploaded_file,
+                status=CodeCheckStatus.DONE.value,
+                last_check_result='Without problems',
+            )
+            CheckLog.objects.bulk_create(CheckLog(code_check=code_check, log_text='Checked') for _ in range(3))
+
+        with CaptureQueriesContext(connection) as many_checks_queries:
+            response = self.client.get(url)
+
+        assert len(many_checks_queries) == len(single_check_queries)
+        assert response.context['report'][0]['status'] == CodeCheckStatus.DONE.label
+        assert response.context['logs_info'].paginator.count == 3
+        assert len(response.context['logs_info']) == 2
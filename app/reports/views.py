@@ -3,16 +3,20 @@ import logging
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import DetailView
 
-from code_checker.models import CodeCheck
 from code_files.models import UploadedFile
 from common.views import TitleMixin
-from reports.reports_services import create_paginator, generate_context, generate_report_info
+from reports.reports_services import (
+    create_paginator,
+    generate_context,
+    generate_report_info,
+    get_latest_code_checks,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class FileReportView(LoginRequiredMixin, TitleMixin, DetailView):
-    model = UploadedFile
+    queryset = UploadedFile.objects.select_related('user')
     title = 'Flake review - Report'
     template_name = 'reports/check_report.html'
     context_object_name = 'file_obj'
@@ -21,21 +25,22 @@ class FileReportView(LoginRequiredMixin, TitleMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        file_obj = self.get_object()
+        file_obj = self.object
 
-        code_checks = CodeCheck.objects.filter(file=file_obj)
+        code_checks = get_latest_code_checks(file_obj=file_obj)
         reports = generate_report_info(code_checks=code_checks)
+        latest_report = reports[0] if reports else {}
 
         result_info = create_paginator(
             request=self.request,
             page_count=5,
-            obj=reports[0].get('results'),
+            obj=latest_report.get('results', []),
             prefix='results',
         )
         logs_info = create_paginator(
             request=self.request,
             page_count=2,
-            obj=reports[0].get('logs'),
+            obj=latest_report.get('logs', []),
             prefix='logs',
         )
 